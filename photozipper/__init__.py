@@ -10,6 +10,6 @@ __version__ = "1.0.0"
 __author__ = "PhotoZipper Team"
 
 # Expose main components
-from photozipper.cli import main
+from photozipper.cli import main, run
 
-__all__ = ["main", "__version__"]
+__all__ = ["main", "run", "__version__"]
@@ -4,25 +4,41 @@ This module provides the CLI interface and main orchestration logic.
 """
 
 import argparse
+import functools
+import logging
+import os
+import re
 import shutil
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
+from typing import Dict, FrozenSet, Optional, Sequence, Tuple, Union
 
 from tqdm import tqdm
 
 from photozipper import __version__
-from photozipper.logger import setup_logging
-from photozipper.pattern_matcher import extract_group, scan_and_group, validate_pattern
+from photozipper.logger import close_logging, flush_logging, setup_logging
+from photozipper.pattern_matcher import (
+    extract_group,
+    normalize_extensions,
+    scan_and_group,
+    validate_pattern,
+)
 from photozipper.file_organizer import (
     create_folder,
     copy_file_with_metadata,
-    verify_copy,
-    handle_merge,
-    delete_original
+    delete_original,
+    SKIPPED
 )
-from photozipper.zip_creator import create_zip
-from photozipper.models import OperationResult, FileOperation
+from photozipper.zip_creator import create_zip, create_zip_from_files
+from photozipper.models import OperationResult, FileOperation, SourceFile
+
+# Default number of concurrent file copies per group
+DEFAULT_WORKERS = 8
+
+# Completed copies accumulated before the progress bar is updated; each
+# tqdm update takes a lock and may re-render, so per-file calls add up
+PROGRESS_BATCH = 64
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -78,6 +94,41 @@ def create_parser() -> argparse.ArgumentParser:
         help='Delete organized folders after creating ZIP files, keeping only the archives'
     )
     
+    parser.add_argument(
+        '--include-ext',
+        type=normalize_extensions,
+        default=None,
+        metavar='EXTS',
+        help='Only organize files with these comma-separated extensions (e.g. .jpg,.heic)'
+    )
+    
+    parser.add_argument(
+        '--exclude-ext',
+        type=normalize_extensions,
+        default=frozenset(),
+        metavar='EXTS',
+        help='Skip files with these comma-separated extensions (e.g. .xmp,.tmp)'
+    )
+    
+    parser.add_argument(
+        '--hardlink',
+        action='store_true',
+        help='Hard-link files into group folders instead of copying them when on the same filesystem'
+    )
+    
+    parser.add_argument(
+        '--verify-checksum',
+        action='store_true',
+        help='Verify each copy by BLAKE2b checksum instead of by size only (reads every copy back)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Number of files to copy concurrently (default: {DEFAULT_WORKERS})'
+    )
+    
     parser.add_argument(
         '--log-level',
         type=str,
@@ -95,6 +146,16 @@ def create_parser() -> argparse.ArgumentParser:
     return parser
 
 
+@functools.lru_cache(maxsize=1)
+def _cached_parser() -> argparse.ArgumentParser:
+    """Return a process-wide parser built once by create_parser.
+    
+    parse_args does not mutate the parser, so repeated in-process
+    main() calls can share it instead of rebuilding every option.
+    """
+    return create_parser()
+
+
 def validate_arguments(args: argparse.Namespace) -> Optional[str]:
     """Validate argument compatibility (returns validation errors - exit 2).
     
@@ -114,74 +175,232 @@ def validate_arguments(args: argparse.Namespace) -> Optional[str]:
     if args.dry_run and args.zip_only:
         return "Error: --dry-run and --zip-only cannot be used together"
     
+    if args.workers < 1:
+        return "Error: --workers must be at least 1"
+    
     return None
 
 
-def main() -> int:
+def _copy_one(
+    source_file: SourceFile,
+    target_path: str,
+    delete_originals: bool,
+    hardlink: bool = False,
+    verify_checksum: bool = False
+) -> Tuple[str, bool]:
+    """Copy, verify and optionally delete a single file (runs on a worker thread).
+    
+    Args:
+        source_file: File to copy
+        target_path: Destination path inside the group folder
+        delete_originals: Delete the source after a verified copy
+        hardlink: Hard-link instead of copying where possible
+        verify_checksum: Verify the copy by checksum, not just by size
+        
+    Returns:
+        Tuple of (action, deleted) where action is 'copy', 'skip'
+        (target already exists) or 'fail'
+    """
+    # Copy is verified by size, and by checksum when requested
+    result = copy_file_with_metadata(
+        source_file.path, target_path,
+        hardlink=hardlink, verify_checksum=verify_checksum
+    )
+    if result == SKIPPED:
+        return ('skip', False)
+    if not result:
+        return ('fail', False)
+    
+    logger = logging.getLogger('photozipper')
+    logger.debug(f"Copied: {source_file.name}")
+    
+    if delete_originals:
+        delete_original(source_file.path)
+        logger.debug(f"Deleted original: {source_file.name}")
+        return ('copy', True)
+    
+    return ('copy', False)
+
+
+def _cancel_pending(futures: Dict[Future, object]) -> None:
+    """Cancel futures that have not started yet.
+    
+    Args:
+        futures: Mapping of submitted futures to their work items
+    """
+    for future in futures:
+        future.cancel()
+
+
+def _collect_zips(
+    zip_futures: Dict[Future, Tuple[Path, Optional[Path]]],
+    logger: logging.Logger
+) -> bool:
+    """Wait for submitted ZIPs, logging each and removing --zip-only folders.
+    
+    Args:
+        zip_futures: Mapping of ZIP futures to (zip_path, folder to remove
+            once archived, or None)
+        logger: Logger for progress and errors
+    
+    Returns:
+        True if every ZIP was created, False on the first failure (ZIPs
+        not yet started are cancelled)
+    """
+    for future in as_completed(zip_futures):
+        zip_path, remove_folder = zip_futures[future]
+        try:
+            future.result()
+            logger.info(f"Created ZIP: {zip_path.name}")
+            
+            # Delete folder if --zip-only is specified
+            if remove_folder is not None:
+                shutil.rmtree(remove_folder)
+                logger.info(f"Removed folder: {remove_folder.name}")
+        except Exception as e:
+            logger.error(f"Error creating ZIP for {zip_path.stem}: {e}")
+            _cancel_pending(zip_futures)
+            return False
+    return True
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
     """Main entry point for PhotoZipper CLI.
     
+    Args:
+        argv: Command-line arguments without the program name
+            (defaults to sys.argv[1:])
+    
     Returns:
         Exit code (0=success, 1=operation error, 2=validation error)
     """
-    # Configure stdout/stderr to use UTF-8 on Windows for Unicode support
+    # Configure stdout/stderr to use UTF-8 on Windows for Unicode support;
+    # streams that aren't real console/pipe wrappers are left alone
     if sys.platform == 'win32':
-        import io
-        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-        sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+        for stream in (sys.stdout, sys.stderr):
+            if hasattr(stream, 'reconfigure'):
+                stream.reconfigure(encoding='utf-8', errors='replace')
+    
+    if argv is None:
+        argv = sys.argv[1:]
     
     # Parse arguments
-    parser = create_parser()
+    parser = _cached_parser()
     
     # Handle case where no arguments provided
-    if len(sys.argv) == 1:
+    if not argv:
         parser.print_help()
         return 2
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
+    return run(
+        args.source,
+        args.pattern,
+        args.output,
+        dry_run=args.dry_run,
+        delete_originals=args.delete_originals,
+        zip_only=args.zip_only,
+        log_level=args.log_level,
+        workers=args.workers,
+        hardlink=args.hardlink,
+        verify_checksum=args.verify_checksum,
+        include_ext=args.include_ext,
+        exclude_ext=args.exclude_ext,
+    )
+
+
+def run(
+    source: Union[str, Path],
+    pattern: Union[str, re.Pattern],
+    output: Union[str, Path],
+    *,
+    dry_run: bool = False,
+    delete_originals: bool = False,
+    zip_only: bool = False,
+    log_level: str = 'INFO',
+    workers: int = DEFAULT_WORKERS,
+    hardlink: bool = False,
+    verify_checksum: bool = False,
+    include_ext: Optional[FrozenSet[str]] = None,
+    exclude_ext: FrozenSet[str] = frozenset(),
+) -> int:
+    """Organize source into output; the programmatic equivalent of the CLI.
+    
+    Keyword arguments mirror the command-line flags. Messages go to
+    stdout/stderr exactly as they do for main(). Work runs on threads
+    only, so a plain script can call this without an
+    ``if __name__ == "__main__"`` guard.
+    
+    Args:
+        source: Source directory containing files to organize
+        pattern: Regex string, or an already compiled pattern (reused
+            as-is, so repeated calls skip validation and compilation)
+        output: Output directory for organized files and ZIPs
+        dry_run: Report what would be done without changing anything
+        delete_originals: Delete source files after verified copies
+        zip_only: Keep only the ZIP archives, not the group folders
+        log_level: One of DEBUG, INFO, WARNING, ERROR
+        workers: Concurrent file copies per group
+        hardlink: Hard-link instead of copying where possible
+        verify_checksum: Verify copies by BLAKE2b checksum, not just by size
+        include_ext: Only process these extensions (see normalize_extensions)
+        exclude_ext: Skip these extensions
+    
+    Returns:
+        Exit code (0=success, 1=operation error)
+    """
     # Validate arguments (operation error - exit 1)
+    args = argparse.Namespace(
+        dry_run=dry_run,
+        delete_originals=delete_originals,
+        zip_only=zip_only,
+        workers=workers,
+    )
     error_msg = validate_arguments(args)
     if error_msg:
         print(error_msg, file=sys.stderr)
         return 1
     
     # Convert paths
-    source_dir = Path(args.source)
-    output_dir = Path(args.output)
+    source_dir = Path(source)
+    output_dir = Path(output)
     
     # Validate source directory exists (operation error - exit 1)
     if not source_dir.exists():
-        print(f"Error: Source directory does not exist: {args.source}", file=sys.stderr)
+        print(f"Error: Source directory does not exist: {source}", file=sys.stderr)
         return 1
     
     if not source_dir.is_dir():
-        print(f"Error: Source path is not a directory: {args.source}", file=sys.stderr)
+        print(f"Error: Source path is not a directory: {source}", file=sys.stderr)
         return 1
     
     # Validate pattern (operation error - exit 1)
     try:
-        validate_pattern(args.pattern)
+        pattern = validate_pattern(pattern)
     except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
     
     # Set up logging
-    logger = setup_logging(output_dir, args.log_level)
+    logger = setup_logging(output_dir, log_level)
     
     try:
         # Log start
-        if args.dry_run:
+        if dry_run:
             logger.info("[DRY RUN] Starting organization (no changes will be made)")
         else:
             logger.info("Starting organization")
         
         logger.info(f"Source: {source_dir}")
-        logger.info(f"Pattern: {args.pattern}")
+        logger.info(f"Pattern: {pattern.pattern}")
         logger.info(f"Output: {output_dir}")
         
         # Scan and group files
         logger.info("Scanning source directory...")
-        groups = scan_and_group(source_dir, args.pattern)
+        groups = scan_and_group(
+            source_dir, pattern, include_ext, exclude_ext
+        )
         
         if not groups:
             logger.warning("No files matched the pattern")
@@ -195,87 +414,132 @@ def main() -> int:
         files_skipped = 0
         files_deleted = 0
         
+        # ZIP future -> (zip_path, folder to remove once archived)
+        zip_futures = {}
+        
+        # With --zip-only and no deletion there is nothing to verify a copy
+        # against, so source files are streamed straight into the ZIP (unless
+        # the group folder is left over from an earlier run, see below)
+        stream_to_zip = zip_only and not delete_originals
+        
         # Calculate total files for progress tracking
         total_files = sum(g.file_count() for g in groups)
         
-        # Process each group with progress bar
-        with tqdm(total=total_files, desc="Organizing files", unit="file", disable=args.dry_run) as pbar_files:
-            for group in tqdm(groups, desc="Processing groups", unit="group", leave=False, disable=args.dry_run):
+        # Process each group with progress bar; copies within a group run
+        # concurrently on a bounded thread pool since they are I/O-bound.
+        # ZIPs are independent per group, so each group's archive is handed
+        # to a second thread pool as soon as its copies finish, overlapping
+        # with the next group's copies. zlib releases the GIL while
+        # compressing, so archives still deflate in parallel, and no worker
+        # process re-imports the caller's __main__
+        max_zip_workers = min(len(groups), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor, \
+                ThreadPoolExecutor(max_workers=max_zip_workers) as zip_executor, \
+                tqdm(total=total_files, desc="Organizing files", unit="file", disable=dry_run) as pbar_files:
+            for group in tqdm(groups, desc="Processing groups", unit="group", leave=False, disable=dry_run):
+                # Write out the buffered log at each group boundary, so a
+                # long run's log file keeps up with its progress
+                flush_logging(logger)
                 group_name = group.name
                 logger.info(f"Processing group '{group_name}' ({group.file_count()} file(s))")
                 
                 # Create group folder
                 group_folder = output_dir / group_name
+                # Per-file targets are joined as plain strings; Path's '/'
+                # re-parses on every call and this loop runs once per file
+                group_prefix = str(group_folder) + os.sep
+                zip_path = output_dir / f"{group_name}.zip"
+                
+                # A folder from an earlier run without --zip-only is merged,
+                # zipped and removed as usual so its files aren't left behind
+                if stream_to_zip and not group_folder.exists():
+                    future = zip_executor.submit(
+                        create_zip_from_files,
+                        [source_file.path for source_file in group.files],
+                        zip_path,
+                    )
+                    zip_futures[future] = (zip_path, None)
+                    files_copied += group.file_count()
+                    pbar_files.update(group.file_count())
+                    continue
                 
-                if not args.dry_run:
+                if not dry_run:
                     create_folder(group_folder)
                     logger.debug(f"Created folder: {group_folder}")
                 else:
                     logger.info(f"[DRY RUN] Would create folder: {group_folder}")
                 
                 # Copy files
+                futures = {}
                 for source_file in group.files:
-                    target_path = group_folder / source_file.name
-                    
-                    # Check if merge scenario
-                    should_copy, action = handle_merge(target_path)
-                    
-                    if not should_copy:
-                        logger.info(f"Skipping duplicate: {source_file.name}")
-                        files_skipped += 1
-                        pbar_files.update(1)
-                        continue
+                    target_path = group_prefix + source_file.name
                     
-                    if args.dry_run:
-                        logger.info(f"[DRY RUN] Would copy: {source_file.name} -> {target_path}")
+                    if dry_run:
+                        # Merge check; real runs detect duplicates atomically on create
+                        if os.path.exists(target_path):
+                            logger.info(f"Skipping duplicate: {source_file.name}")
+                            files_skipped += 1
+                        else:
+                            logger.info(f"[DRY RUN] Would copy: {source_file.name} -> {target_path}")
                     else:
-                        try:
-                            # Copy file
-                            copy_file_with_metadata(source_file.path, target_path)
-                            
-                            # Verify copy
-                            if verify_copy(source_file.path, target_path):
-                                logger.debug(f"Copied: {source_file.name}")
-                                files_copied += 1
-                                pbar_files.update(1)
-                                
-                                # Delete original if requested
-                                if args.delete_originals:
-                                    delete_original(source_file.path)
-                                    logger.debug(f"Deleted original: {source_file.name}")
-                                    files_deleted += 1
-                            else:
-                                logger.error(f"Copy verification failed: {source_file.name}")
-                                pbar_files.close()
-                                return 1
-                        except Exception as e:
-                            logger.error(f"Error copying {source_file.name}: {e}")
-                            pbar_files.close()
-                            return 1
-                
-                # Create ZIP
-                zip_path = output_dir / f"{group_name}.zip"
+                        future = executor.submit(
+                            _copy_one, source_file, target_path,
+                            delete_originals, hardlink, verify_checksum
+                        )
+                        futures[future] = source_file
                 
-                if not args.dry_run:
+                # Collect copy results as they finish; abort on first failure
+                pending = 0
+                for future in as_completed(futures):
+                    source_file = futures[future]
                     try:
-                        create_zip(group_folder, zip_path)
-                        logger.info(f"Created ZIP: {zip_path.name}")
-                        
-                        # Delete folder if --zip-only is specified
-                        if args.zip_only:
-                            shutil.rmtree(group_folder)
-                            logger.info(f"Removed folder: {group_folder.name}")
+                        action, deleted = future.result()
                     except Exception as e:
-                        logger.error(f"Error creating ZIP for {group_name}: {e}")
+                        logger.error(f"Error copying {source_file.name}: {e}")
+                        _cancel_pending(futures)
                         pbar_files.close()
+                        # Groups already copied still get their ZIPs
+                        _collect_zips(zip_futures, logger)
                         return 1
+                    
+                    if action == 'fail':
+                        logger.error(f"Copy verification failed: {source_file.name}")
+                        _cancel_pending(futures)
+                        pbar_files.close()
+                        # Groups already copied still get their ZIPs
+                        _collect_zips(zip_futures, logger)
+                        return 1
+                    
+                    pending += 1
+                    if pending >= PROGRESS_BATCH:
+                        pbar_files.update(pending)
+                        pending = 0
+                    if action == 'skip':
+                        logger.info(f"Skipping duplicate: {source_file.name}")
+                        files_skipped += 1
+                        continue
+                    
+                    files_copied += 1
+                    if deleted:
+                        files_deleted += 1
+                if pending:
+                    pbar_files.update(pending)
+                
+                # Start this group's ZIP now that all its copies are done
+                if not dry_run:
+                    future = zip_executor.submit(create_zip, group_folder, zip_path)
+                    zip_futures[future] = (zip_path, group_folder if zip_only else None)
                 else:
                     logger.info(f"[DRY RUN] Would create ZIP: {zip_path.name}")
-                    if args.zip_only:
+                    if zip_only:
                         logger.info(f"[DRY RUN] Would remove folder: {group_name}")
+            
+            # Wait for the remaining ZIPs
+            if not _collect_zips(zip_futures, logger):
+                return 1
         
         # Print summary
-        if args.dry_run:
+        if dry_run:
             summary = f"[DRY RUN] Would process {sum(g.file_count() for g in groups)} files in {len(groups)} groups"
         else:
             summary = f"Successfully organized {files_copied} files into {len(groups)} groups"
@@ -299,6 +563,10 @@ def main() -> int:
         logger.error(f"Unexpected error: {e}")
         print(f"Error: {e}", file=sys.stderr)
         return 1
+    
+    finally:
+        # Write out the buffered log and release the log file
+        close_logging(logger)
 
 
 if __name__ == '__main__':
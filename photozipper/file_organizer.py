@@ -2,15 +2,45 @@
 
 This module provides functions to:
 - Create folders for organized files
-- Copy files with metadata preservation
-- Verify successful copies
-- Handle merge scenarios
+- Copy files with metadata preservation (in-kernel where supported),
+  or hard-link them on the same filesystem
+- Verify successful copies by size, and optionally by checksum
+- Skip files that already exist in the target (merge scenarios)
 - Delete original files after successful operations
 """
 
+import errno
+import hashlib
+import os
 import shutil
+import stat
 from pathlib import Path
-from typing import Tuple
+from typing import BinaryIO, Optional, Union
+
+# Returned by copy_file_with_metadata() when the target already exists
+SKIPPED = 'skip'
+
+# Create the target atomically, failing if it already exists
+_EXCL_CREATE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+
+# Buffer size for the userspace copy fallback
+_COPY_BUFSIZE = 1024 * 1024
+
+# Upper bound per copy_file_range() call; the kernel loops until EOF
+_COPY_RANGE_CHUNK = 1024 * 1024 * 1024
+
+# copy_file_range() errors that mean "not supported here", not "copy failed"
+_COPY_RANGE_UNSUPPORTED = frozenset({
+    errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP,
+})
+
+# Permissions and timestamps can be applied through open descriptors
+_METADATA_BY_FD = hasattr(os, 'fchmod') and os.utime in os.supports_fd
+
+# os.link() errors that mean "can't link here", so a real copy is made instead
+_LINK_UNSUPPORTED = frozenset({
+    errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP, errno.ENOTSUP,
+})
 
 
 def create_folder(folder_path: Path) -> None:
@@ -22,64 +52,226 @@ def create_folder(folder_path: Path) -> None:
     folder_path.mkdir(parents=True, exist_ok=True)
 
 
-def copy_file_with_metadata(source: Path, target: Path) -> bool:
-    """Copy file preserving metadata (timestamps, permissions).
+def copy_file_with_metadata(
+    source: Union[str, Path],
+    target: Union[str, Path],
+    hardlink: bool = False,
+    verify_checksum: bool = False
+) -> Union[bool, str]:
+    """Copy file preserving metadata (timestamps, permissions) and verify it.
     
-    Uses shutil.copy2() which preserves metadata.
+    The target is created with O_CREAT|O_EXCL, so an existing file is
+    detected atomically by the open itself instead of a separate exists()
+    check, and is never overwritten (merge behavior).
+    
+    File data is copied in-kernel where possible (see _copy_file_data),
+    then permissions and timestamps are applied through the open file
+    descriptors (or by path once the target is closed, where the platform
+    lacks fd-based fchmod/utime). The copy is verified by size, against the source size
+    taken from its open descriptor. With verify_checksum=True the source
+    is also hashed (BLAKE2b) as it is copied, and the digest is compared
+    against the target read back while it is still hot in the page
+    cache. A failed copy is removed so a re-run doesn't mistake it for a
+    duplicate.
+    
+    With hardlink=True the target is first created with os.link(), which
+    shares the source inode (data and metadata) and needs no verification.
+    If the filesystem can't link the two paths (e.g. different devices),
+    a regular copy is made instead.
     
     Args:
         source: Source file path
         target: Target file path
+        hardlink: Try to hard-link the target to the source first
+        verify_checksum: Also compare BLAKE2b digests of source and target
         
     Returns:
-        True if copy succeeds, False if error occurs
+        True if copy succeeds and verifies, SKIPPED if the target
+        already exists, False otherwise
     """
+    if hardlink:
+        try:
+            os.link(source, target)
+            return True
+        except FileExistsError:
+            return SKIPPED
+        except OSError as e:
+            if e.errno not in _LINK_UNSUPPORTED:
+                return False
+    
     try:
-        shutil.copy2(source, target)
-        return True
+        dst_fd = os.open(target, _EXCL_CREATE_FLAGS, 0o644)
+    except FileExistsError:
+        return SKIPPED
     except (PermissionError, OSError):
         return False
+    
+    source_hash = hashlib.blake2b() if verify_checksum else None
+    try:
+        with open(dst_fd, 'wb') as fdst, open(source, 'rb') as fsrc:
+            _fadvise(fsrc.fileno(), 'POSIX_FADV_SEQUENTIAL')
+            size = os.fstat(fsrc.fileno()).st_size
+            _copy_file_data(fsrc, fdst, size, source_hash)
+            fdst.flush()
+            if _METADATA_BY_FD:
+                _copy_metadata(fsrc.fileno(), fdst.fileno())
+            # The source won't be read again
+            _fadvise(fsrc.fileno(), 'POSIX_FADV_DONTNEED')
+        
+        # The path-based fallback runs once the target is closed; Windows
+        # can refuse utime() on a file that still has an open handle
+        if not _METADATA_BY_FD:
+            shutil.copystat(source, target)
+        
+        ok = verify_copy(size, target)
+        # A size mismatch fails fast without reading the target back
+        if ok and source_hash is not None:
+            ok = source_hash.digest() == _file_digest(target)
+    except (PermissionError, OSError):
+        ok = False
+    
+    if not ok:
+        _remove_partial(target)
+    return ok
 
 
-def verify_copy(source: Path, target: Path) -> bool:
-    """Verify that a file was copied successfully.
+def _copy_metadata(src_fd: int, dst_fd: int) -> None:
+    """Copy permissions and timestamps from source to target.
     
-    Verifies by comparing file sizes.
+    Uses fchmod()/futimens() on the open descriptors to avoid re-resolving
+    both paths. Only used where _METADATA_BY_FD is set; elsewhere
+    copy_file_with_metadata() calls shutil.copystat() after closing the
+    target.
+    
+    Args:
+        src_fd: Open source file descriptor
+        dst_fd: Open target file descriptor (data already flushed)
+    """
+    st = os.fstat(src_fd)
+    os.fchmod(dst_fd, stat.S_IMODE(st.st_mode))
+    os.utime(dst_fd, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def _remove_partial(target: Union[str, Path]) -> None:
+    """Best-effort removal of a partially written or unverified copy.
     
     Args:
-        source: Source file path
         target: Target file path
+    """
+    try:
+        os.unlink(target)
+    except OSError:
+        pass
+
+
+def _file_digest(path: Union[str, Path]) -> bytes:
+    """Compute a BLAKE2b digest of a file's contents.
+    
+    Args:
+        path: File to hash
         
     Returns:
-        True if verification succeeds, False otherwise
+        Raw digest bytes
     """
-    # Check if target exists
-    if not target.exists():
-        return False
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, 'blake2b').digest()
+
+
+def _fadvise(fd: int, advice: str) -> None:
+    """Best-effort posix_fadvise() over the whole file.
+    
+    Silently does nothing where posix_fadvise() is unavailable
+    (Windows, macOS) or the filesystem rejects the hint.
+    
+    Args:
+        fd: Open file descriptor
+        advice: Name of the os.POSIX_FADV_* constant
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+    except OSError:
+        pass
+
+
+def _copy_file_data(
+    fsrc: BinaryIO,
+    fdst: BinaryIO,
+    size: int,
+    source_hash: Optional[hashlib.blake2b] = None
+) -> None:
+    """Copy file contents without bouncing through a userspace buffer.
+    
+    On Linux, os.copy_file_range() copies entirely in the kernel and can
+    reflink on XFS/Btrfs. If the kernel or filesystem pair doesn't support
+    it (e.g. EXDEV on older kernels), or on other platforms, falls back to
+    a 1 MiB buffered copy.
     
-    # Compare file sizes
-    source_size = source.stat().st_size
-    target_size = target.stat().st_size
+    When source_hash is given, the data has to pass through userspace to
+    be hashed, so the buffered copy is used and every block is fed to the
+    hash as it is written; the source is still read only once.
     
-    return source_size == target_size
+    Args:
+        fsrc: Source file opened for binary reading
+        fdst: Empty target file opened for binary writing
+        size: Source file size in bytes
+        source_hash: Hash object to update with the source data, if any
+        
+    Raises:
+        OSError: If the copy fails
+    """
+    if source_hash is not None:
+        while block := fsrc.read(_COPY_BUFSIZE):
+            source_hash.update(block)
+            fdst.write(block)
+        return
+    
+    if hasattr(os, 'copy_file_range'):
+        src_fd = fsrc.fileno()
+        dst_fd = fdst.fileno()
+        
+        try:
+            copied = 0
+            while True:
+                sent = os.copy_file_range(src_fd, dst_fd, _COPY_RANGE_CHUNK)
+                if sent == 0:
+                    break
+                copied += sent
+            # Some virtual filesystems report EOF immediately; don't trust
+            # an empty copy of a non-empty file
+            if copied == size or size == 0:
+                return
+        except OSError as e:
+            if e.errno not in _COPY_RANGE_UNSUPPORTED:
+                raise
+        
+        # Restart the copy in userspace from the beginning
+        fsrc.seek(0)
+        fdst.seek(0)
+        fdst.truncate()
+    
+    shutil.copyfileobj(fsrc, fdst, _COPY_BUFSIZE)
 
 
-def handle_merge(target: Path) -> Tuple[bool, str]:
-    """Handle merge scenario where target file already exists.
+def verify_copy(expected_size: int, target: Union[str, Path]) -> bool:
+    """Verify that a file was copied successfully.
     
-    If file exists with same name, skip copying (no overwrite).
+    Verifies by comparing the target's size against the source size
+    already known to the caller, so only the target is stat()ed.
     
     Args:
+        expected_size: Source file size in bytes
         target: Target file path
         
     Returns:
-        Tuple of (should_copy, action_taken)
-        - should_copy: True if file should be copied, False to skip
-        - action_taken: Description of action ('skip' or 'copy')
+        True if verification succeeds, False otherwise
     """
-    if target.exists():
-        return (False, 'skip')
-    return (True, 'copy')
+    # A missing target surfaces from the single stat() call
+    try:
+        return os.stat(target).st_size == expected_size
+    except FileNotFoundError:
+        return False
 
 
 def delete_original(file_path: Path) -> bool:
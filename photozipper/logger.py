@@ -2,36 +2,48 @@
 
 This module provides centralized logging setup with:
 - Console handler (INFO level)
-- File handler (DEBUG level)
+- File handler (DEBUG level), buffered in memory
 - Consistent formatting across handlers
 """
 
 import logging
+import logging.handlers
 from pathlib import Path
 from typing import Optional
 
+# Records buffered before the log file is written; ERROR and above are
+# written immediately so failures are never lost
+LOG_BUFFER_CAPACITY = 1024
+
 
 def setup_logging(
     output_dir: Path,
-    log_level: str = "INFO"
+    log_level: str = "INFO",
+    logger: Optional[logging.Logger] = None
 ) -> logging.Logger:
     """Set up logging with console and file handlers.
     
     Creates a logger with two handlers:
     1. Console handler - INFO level, outputs to stdout
-    2. File handler - DEBUG level, writes to photozipper.log in output_dir
+    2. File handler - DEBUG level, writes to photozipper.log in output_dir.
+       Records are batched through a MemoryHandler so per-file DEBUG
+       messages don't each cost a write; call flush_logging() or
+       close_logging() to write out the remainder.
     
     Args:
         output_dir: Directory where log file will be created
         log_level: Log level for console output (DEBUG, INFO, WARNING, ERROR)
+        logger: Logger to configure (defaults to the 'photozipper' logger)
         
     Returns:
         Configured logger instance
     """
-    # Create logger
-    logger = logging.getLogger('photozipper')
+    if logger is None:
+        logger = logging.getLogger('photozipper')
     
-    # Clear any existing handlers to avoid duplicates
+    # Close and clear any existing handlers to avoid duplicates; closing
+    # flushes anything still buffered from a previous setup
+    close_logging(logger)
     logger.handlers.clear()
     
     # Set logger level to DEBUG to capture everything
@@ -60,9 +72,44 @@ def setup_logging(
         file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        buffered_handler = logging.handlers.MemoryHandler(
+            capacity=LOG_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=file_handler
+        )
+        buffered_handler.setLevel(logging.DEBUG)
+        logger.addHandler(buffered_handler)
     except (OSError, PermissionError) as e:
         # If file handler fails, log to console only
         logger.warning(f"Could not create log file: {e}")
     
     return logger
+
+
+def flush_logging(logger: Optional[logging.Logger] = None) -> None:
+    """Write out any buffered log records.
+    
+    Args:
+        logger: Logger to flush (defaults to the 'photozipper' logger)
+    """
+    if logger is None:
+        logger = logging.getLogger('photozipper')
+    for handler in logger.handlers:
+        handler.flush()
+
+
+def close_logging(logger: Optional[logging.Logger] = None) -> None:
+    """Flush and close all handlers, releasing the log file.
+    
+    Args:
+        logger: Logger to close (defaults to the 'photozipper' logger)
+    """
+    if logger is None:
+        logger = logging.getLogger('photozipper')
+    for handler in list(logger.handlers):
+        # MemoryHandler.close() flushes but leaves its target open
+        target = getattr(handler, 'target', None)
+        handler.close()
+        if target is not None:
+            target.close()
+        logger.removeHandler(handler)
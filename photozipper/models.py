@@ -8,26 +8,34 @@ This module defines the core data structures used throughout the application:
 - FileOperation: Individual file operation record
 """
 
+import os
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
+# On Windows the directory listing already carries size and mtime, so
+# DirEntry.stat() is free; elsewhere it costs a stat() syscall per file
+_STAT_IS_FREE = os.name == 'nt'
 
-@dataclass
+
+@dataclass(slots=True)
 class SourceFile:
     """Represents a source file to be organized.
     
+    Uses __slots__ since one instance exists per scanned file.
+    
     Attributes:
         path: Full path to the file
         name: Filename (basename)
-        size: File size in bytes
-        modified_time: Last modification time (Unix timestamp)
+        size: File size in bytes, or None if not read during the scan
+        modified_time: Last modification time (Unix timestamp), or None
+            if not read during the scan
         group: Group identifier extracted from filename
     """
     path: Path
     name: str
-    size: int
-    modified_time: float
+    size: Optional[int]
+    modified_time: Optional[float]
     group: str
     
     @classmethod
@@ -49,9 +57,36 @@ class SourceFile:
             modified_time=stat.st_mtime,
             group=group
         )
+    
+    @classmethod
+    def from_dir_entry(cls, entry: os.DirEntry, group: str) -> "SourceFile":
+        """Create a SourceFile instance from an os.scandir() entry.
+        
+        Size and mtime are only filled in where the directory listing
+        already provides them (Windows). Elsewhere they are left as None so
+        the scan stays readdir-only; nothing before the copy needs them.
+        
+        Args:
+            entry: Directory entry returned by os.scandir()
+            group: Group identifier for this file
+            
+        Returns:
+            SourceFile instance
+        """
+        size = modified_time = None
+        if _STAT_IS_FREE:
+            stat = entry.stat()
+            size, modified_time = stat.st_size, stat.st_mtime
+        return cls(
+            path=Path(entry.path),
+            name=entry.name,
+            size=size,
+            modified_time=modified_time,
+            group=group
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class FileGroup:
     """Collection of files belonging to the same group.
     
@@ -99,7 +134,7 @@ class OrganizeOperation:
     delete_originals: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class FileOperation:
     """Record of an individual file operation.
     
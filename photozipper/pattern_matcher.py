@@ -4,38 +4,60 @@ This module provides functions to:
 - Validate regex patterns
 - Extract group identifiers from filenames
 - Scan directories and organize files into groups
+- Filter files by extension
 """
 
+import functools
+import os
 import re
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, FrozenSet, Optional, Union
 
 from photozipper.models import FileGroup, SourceFile
 
 
-def validate_pattern(pattern: str) -> bool:
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> re.Pattern:
+    """Compile a pattern string, memoized per distinct string.
+    
+    Repeated in-process runs with the same --pattern skip the re
+    module's own cache key construction and lookup. Invalid patterns
+    raise re.error and are not cached.
+    """
+    return re.compile(pattern)
+
+
+def validate_pattern(pattern: Union[str, re.Pattern]) -> re.Pattern:
     """Validate that a pattern is a valid regex.
     
+    The compiled pattern is returned so callers can pass it on to
+    scan_and_group() instead of compiling it a second time. An
+    already compiled pattern is returned unchanged.
+    
     Args:
-        pattern: Pattern string to validate
+        pattern: Pattern string (or compiled pattern) to validate
         
     Returns:
-        True if pattern is valid
+        Compiled pattern
         
     Raises:
         ValueError: If pattern is empty or invalid regex
     """
+    if isinstance(pattern, re.Pattern):
+        if not pattern.pattern.strip():
+            raise ValueError("Pattern cannot be empty")
+        return pattern
+    
     if not pattern or not pattern.strip():
         raise ValueError("Pattern cannot be empty")
     
     try:
-        re.compile(pattern)
-        return True
+        return _compile_pattern(pattern)
     except re.error as e:
         raise ValueError(f"Invalid regex pattern: {e}")
 
 
-def extract_group(filename: str, pattern: str) -> Optional[str]:
+def extract_group(filename: str, pattern: Union[str, re.Pattern]) -> Optional[str]:
     """Extract group identifier from filename using pattern.
     
     The function searches for the pattern in the filename and returns
@@ -43,49 +65,110 @@ def extract_group(filename: str, pattern: str) -> Optional[str]:
     
     Args:
         filename: Filename to extract group from
-        pattern: Regex pattern to match
+        pattern: Regex pattern (string or precompiled) to match
         
     Returns:
         Group identifier if match found, None otherwise
     """
-    match = re.search(pattern, filename)
+    if not isinstance(pattern, re.Pattern):
+        pattern = _compile_pattern(pattern)
+    return _extract_group_compiled(pattern, filename)
+
+
+def _extract_group_compiled(compiled: re.Pattern, filename: str) -> Optional[str]:
+    """Extract group identifier using an already compiled pattern.
+    
+    Args:
+        compiled: Compiled regex pattern
+        filename: Filename to extract group from
+        
+    Returns:
+        Group identifier if match found, None otherwise
+    """
+    match = compiled.search(filename)
     if match:
         return match.group(0)
     return None
 
 
-def scan_and_group(source_dir: Path, pattern: str) -> list[FileGroup]:
+def normalize_extensions(value: str) -> FrozenSet[str]:
+    """Parse a comma-separated extension list such as '.jpg,HEIC'.
+    
+    Args:
+        value: Comma-separated extensions, with or without leading dots
+        
+    Returns:
+        Lowercased extensions without leading dots
+    """
+    return frozenset(
+        ext.strip().lstrip('.').lower()
+        for ext in value.split(',')
+        if ext.strip()
+    )
+
+
+def _extension(filename: str) -> str:
+    """Return the lowercased extension of a filename without the dot."""
+    _, dot, ext = filename.rpartition('.')
+    return ext.lower() if dot else ''
+
+
+def scan_and_group(
+    source_dir: Path,
+    pattern: Union[str, re.Pattern],
+    include_exts: Optional[FrozenSet[str]] = None,
+    exclude_exts: FrozenSet[str] = frozenset()
+) -> list[FileGroup]:
     """Scan directory and group files by pattern matches.
     
+    The pattern is compiled once per scan rather than once per file.
+    Extension filters are applied first, so filtered entries cost one
+    string split and a set lookup.
+    
     Args:
         source_dir: Directory to scan
-        pattern: Regex pattern to match filenames
+        pattern: Regex pattern (string or precompiled) to match filenames
+        include_exts: If given, only files with these extensions are kept
+            (lowercase, no leading dot; see normalize_extensions)
+        exclude_exts: Files with these extensions are skipped
         
     Returns:
         List of FileGroup objects
     """
+    # re.compile() returns an already compiled pattern unchanged
+    compiled = re.compile(pattern)
     groups_dict: Dict[str, FileGroup] = {}
     
-    # Iterate through all items in source directory
-    for item in source_dir.iterdir():
-        # Skip directories - only process files
-        if not item.is_file():
-            continue
-            
-        # Try to extract group from filename
-        group_name = extract_group(item.name, pattern)
-        
-        # Skip files that don't match pattern
-        if group_name is None:
-            continue
+    # Iterate through all entries in source directory; os.scandir() returns
+    # the file type from readdir, so no per-entry stat is needed here
+    with os.scandir(source_dir) as entries:
+        for entry in entries:
+            # Cheapest check first: filter by extension
+            if include_exts is not None or exclude_exts:
+                ext = _extension(entry.name)
+                if ext in exclude_exts or (include_exts is not None and ext not in include_exts):
+                    continue
             
-        # Create group if it doesn't exist
-        if group_name not in groups_dict:
-            groups_dict[group_name] = FileGroup(name=group_name)
+            # Skip directories - only process files (symlinks to files
+            # included); for regular files the type comes from readdir
+            if not entry.is_file():
+                continue
+                
+            # Try to extract group from filename
+            group_name = _extract_group_compiled(compiled, entry.name)
             
-        # Create SourceFile and add to group
-        source_file = SourceFile.from_path(item, group_name)
-        groups_dict[group_name].add_file(source_file)
+            # Skip files that don't match pattern
+            if group_name is None:
+                continue
+                
+            # Look the group up once; setdefault() would build a throwaway
+            # FileGroup on every call, so only create one on a miss
+            group = groups_dict.get(group_name)
+            if group is None:
+                group = groups_dict[group_name] = FileGroup(name=group_name)
+                
+            # Create SourceFile and add to group
+            group.files.append(SourceFile.from_dir_entry(entry, group_name))
     
     # Return as list
     return list(groups_dict.values())
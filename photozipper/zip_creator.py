@@ -2,19 +2,35 @@
 
 This module provides functions to:
 - Create ZIP archives from folders
+- Create ZIP archives directly from source files
 - Add files to ZIP with proper compression
 - Handle Unicode filenames in ZIP archives
 """
 
+import os
 import zipfile
 from pathlib import Path
+from typing import Iterable, Union
+
+# Output buffer size; coalesces the many small header/descriptor writes
+# zipfile issues per entry into large sequential writes
+_ZIP_BUFSIZE = 1024 * 1024
+
+# Formats that are already entropy-coded; DEFLATE gains <1% on these while
+# dominating CPU time, so they are stored uncompressed instead
+_ALREADY_COMPRESSED = frozenset({
+    '.jpg', '.jpeg', '.png', '.heic', '.heif', '.webp', '.gif',
+    '.mp4', '.mov',
+    '.cr2', '.cr3', '.nef', '.arw', '.raf',
+})
 
 
 def create_zip(folder_path: Path, zip_path: Path) -> None:
     """Create a ZIP archive from a folder.
     
     Creates a ZIP archive containing all files in the folder (non-recursive).
-    Uses ZIP_DEFLATED compression.
+    Uses ZIP_DEFLATED compression, except for already-compressed photo and
+    video formats which are stored as-is.
     
     Args:
         folder_path: Path to folder to zip
@@ -27,7 +43,8 @@ def create_zip(folder_path: Path, zip_path: Path) -> None:
     if not folder_path.exists():
         raise FileNotFoundError(f"Folder not found: {folder_path}")
     
-    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+    with open(zip_path, 'wb', buffering=_ZIP_BUFSIZE) as fp, \
+            zipfile.ZipFile(fp, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
         add_folder_to_zip(zf, folder_path)
 
 
@@ -35,14 +52,45 @@ def add_folder_to_zip(zip_file: zipfile.ZipFile, folder_path: Path) -> None:
     """Add all files from folder to ZIP archive.
     
     Only adds files directly in the folder (non-recursive).
-    Preserves relative paths within the ZIP.
+    Preserves relative paths within the ZIP. Already-compressed formats
+    (see _ALREADY_COMPRESSED) are written with ZIP_STORED; everything else
+    uses the archive's default compression.
     
     Args:
         zip_file: Open ZipFile object
         folder_path: Path to folder containing files to add
     """
-    for item in folder_path.iterdir():
-        # Skip subdirectories - only add files
-        if item.is_file():
-            # Add file with relative path (just the filename)
-            zip_file.write(item, arcname=item.name)
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            # Skip subdirectories - only add files (d_type, no extra stat)
+            if entry.is_file(follow_symlinks=False):
+                # Add file with relative path (just the filename)
+                _write_file(zip_file, entry.path, entry.name)
+
+
+def create_zip_from_files(file_paths: Iterable[Path], zip_path: Path) -> None:
+    """Create a ZIP archive directly from a set of files.
+    
+    Each file is stored under its own name, so the archive matches what
+    create_zip would produce for a folder holding copies of the same files,
+    without writing those copies to disk first.
+    
+    Args:
+        file_paths: Paths of files to add
+        zip_path: Path for output ZIP file
+        
+    Raises:
+        OSError: If IO error occurs
+    """
+    with open(zip_path, 'wb', buffering=_ZIP_BUFSIZE) as fp, \
+            zipfile.ZipFile(fp, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for file_path in file_paths:
+            _write_file(zf, file_path, file_path.name)
+
+
+def _write_file(zip_file: zipfile.ZipFile, file_path: Union[str, Path], arcname: str) -> None:
+    """Write one file, storing already-compressed formats uncompressed."""
+    if os.path.splitext(arcname)[1].lower() in _ALREADY_COMPRESSED:
+        zip_file.write(file_path, arcname=arcname, compress_type=zipfile.ZIP_STORED)
+    else:
+        zip_file.write(file_path, arcname=arcname)
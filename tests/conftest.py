@@ -1,18 +1,317 @@
 """
 Shared pytest configuration and fixtures for all tests.
 """
+import contextlib
+import io
+import os
+import shutil
+import subprocess
 import sys
+import zipfile
 import pytest
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import SimpleNamespace
+
+from photozipper.cli import main, run
+from photozipper.pattern_matcher import validate_pattern
+
+
+# Source layouts shared by the integration tests. The session-scoped trees
+# are built once and must be treated as read-only; tests that modify the
+# source (--delete-originals) use a per-test copy instead.
+VACATION_FILES = {
+    "vacation_beach.jpg": b"test1",
+    "vacation_sunset.jpg": b"test2",
+    "vacation_pool.jpg": b"test3",
+    "work_meeting.jpg": b"test4",
+}
+
+MULTI_GROUP_FILES = {
+    "set1_a.jpg": b"1a",
+    "set1_b.jpg": b"1b",
+    "set2_c.jpg": b"2c",
+    "set2_d.jpg": b"2d",
+    "keep_this.jpg": b"keep",
+}
+
+# Three trip groups (3/2/1 files), four event years and two content-checked
+# group files, shared by the multiple-groups tests
+TRIP_FILES = {
+    "trip2004_01.jpg": b"a",
+    "trip2004_02.jpg": b"b",
+    "trip2004_03.jpg": b"c",
+    "trip2005_01.jpg": b"d",
+    "trip2005_02.jpg": b"e",
+    "trip2006_01.jpg": b"f",
+    "event2020_a.jpg": b"1",
+    "event2021_b.jpg": b"2",
+    "event2022_c.jpg": b"3",
+    "event2023_d.jpg": b"4",
+    "group1_file.jpg": b"content1",
+    "group2_file.jpg": b"content2",
+}
+
+# Unicode names for the basic and zip-archive unicode tests; their patterns
+# ("café|日本語|emoji" and "测试") don't overlap
+UNICODE_FILES = {
+    "café_photo.jpg": b"test1",
+    "日本語.jpg": b"test2",
+    "emoji_😀.jpg": b"test3",
+    "测试_test.jpg": b"data",
+}
+
+# Interpreter + module invocation for the subprocess-based tests; on Windows
+# subprocess.run() doesn't find venv Scripts executables, so always use -m
+_BASE_CMD: tuple[str, ...] = (sys.executable, "-m", "photozipper")
+
+
+def _write_files(dirpath, names_and_bytes, dirfd=None) -> None:
+    """Create each (name, data) file, relative to dirfd when one is given."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    for name, data in names_and_bytes:
+        if dirfd is None:
+            fd = os.open(os.path.join(dirpath, name), flags, 0o644)
+        else:
+            fd = os.open(name, flags, 0o644, dir_fd=dirfd)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+
+def _make_files(dirpath, names_and_bytes, workers: int = 1) -> None:
+    """
+    Create each (name, data) file in dirpath with raw os.open/os.write.
+    
+    Opens relative to a directory fd where the platform supports it, so
+    the directory path is resolved once rather than per file. With
+    workers > 1 the files are split across a thread pool; os.open and
+    os.write release the GIL, so creates overlap on the filesystem.
+    """
+    items = list(names_and_bytes)
+    dirfd = None
+    if os.open in os.supports_dir_fd:
+        dirfd = os.open(dirpath, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        if workers <= 1 or len(items) < 2 * workers:
+            _write_files(dirpath, items, dirfd)
+            return
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # One strided slice per worker keeps per-task overhead negligible
+            futures = [
+                executor.submit(_write_files, dirpath, items[i::workers], dirfd)
+                for i in range(workers)
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        if dirfd is not None:
+            os.close(dirfd)
+
+
+def _build_source_tree(root: Path, files: dict[str, bytes]) -> Path:
+    """Write each name -> content pair into root."""
+    _make_files(root, files.items())
+    return root
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--runslow",
+        action="store_true",
+        default=False,
+        help="run tests marked slow (large collections and timing checks)",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "subprocess: runs photozipper in a separate interpreter to observe real process exit codes",
+    )
+    config.addinivalue_line(
+        "markers",
+        "slow: large-collection/timing tests, skipped unless --runslow is given",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow test; use --runslow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+def invoke_photozipper(args: Sequence[str | os.PathLike]) -> SimpleNamespace:
+    """
+    Run the photozipper CLI in-process with the given arguments.
+    
+    Path arguments are converted with os.fspath. Captures stdout/stderr and
+    returns an object with the same returncode/stdout/stderr attributes as
+    subprocess.CompletedProcess, without paying interpreter startup and
+    package import per call.
+    """
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            returncode = main([os.fspath(arg) for arg in args])
+        except SystemExit as e:
+            # argparse exits for --help, --version and usage errors
+            if e.code is None or isinstance(e.code, int):
+                returncode = e.code or 0
+            else:
+                returncode = 1
+    return SimpleNamespace(returncode=returncode, stdout=out.getvalue(), stderr=err.getvalue())
+
+
+def _read_log(output_dir: Path) -> str:
+    """Read photozipper.log from output_dir in one open/read (raises if missing)."""
+    return (output_dir / "photozipper.log").read_bytes().decode("utf-8", "replace")
+
+
+def _count_files(dirpath, suffix: str = ".jpg") -> int:
+    """Count entries in dirpath whose name ends with suffix (no Path objects built)."""
+    with os.scandir(dirpath) as it:
+        return sum(1 for entry in it if entry.name.endswith(suffix))
+
+
+@pytest.fixture
+def make_tree(tmp_path):
+    """
+    Returns a callable building tmp_path/"source" from files and returning (source, output).
+    
+    files is a name -> bytes mapping or an iterable of (name, bytes) pairs;
+    extra keyword arguments go to _make_files. The output directory is not
+    created, since photozipper creates it on demand.
+    """
+    def make(files, **kwargs):
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        _make_files(source_dir, files.items() if isinstance(files, dict) else files, **kwargs)
+        return source_dir, tmp_path / "output"
+    return make
+
+
+@pytest.fixture(scope="session")
+def count_files():
+    """Returns a callable counting files by suffix in a directory (see _count_files)."""
+    return _count_files
+
+
+def _zip_names(zip_path) -> list[str]:
+    """Return the member names of zip_path, reading its central directory once."""
+    with zipfile.ZipFile(zip_path) as zf:
+        return zf.namelist()
+
+
+@pytest.fixture(scope="session")
+def zip_names():
+    """Returns a callable listing a zip's member names (see _zip_names)."""
+    return _zip_names
+
+
+@pytest.fixture
+def read_log():
+    """Returns a callable mapping an output dir to its log file contents."""
+    return _read_log
+
+
+@pytest.fixture(scope="session")
+def make_files():
+    """Returns a callable creating (name, bytes) files in a directory (see _make_files)."""
+    return _make_files
+
+
+@pytest.fixture(scope="session")
+def run_photozipper():
+    """Returns a callable that runs photozipper in-process (see invoke_photozipper)."""
+    return invoke_photozipper
+
+
+def _invoke(
+    source, pattern: str, output, *extra: str, api: bool = False, **options
+) -> SimpleNamespace:
+    """
+    Run photozipper in-process on source/pattern/output.
+    
+    By default extra CLI flags are parsed by main() as on a real command
+    line. With api=True, photozipper.run() is called directly with the
+    compiled pattern (validate_pattern compiles each string once per
+    session) and options as its keyword arguments (dry_run=True, ...).
+    Both return the same returncode/stdout/stderr shape.
+    """
+    if not api:
+        args = ("--source", source, "--pattern", pattern, "--output", output, *extra)
+        return invoke_photozipper(args)
+    assert not extra, "pass run() keyword options, not CLI flags, with api=True"
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        returncode = run(source, validate_pattern(pattern), output, **options)
+    return SimpleNamespace(returncode=returncode, stdout=out.getvalue(), stderr=err.getvalue())
+
+
+@pytest.fixture(scope="session")
+def invoke():
+    """Returns a callable running photozipper on (source, pattern, output, ...) (see _invoke)."""
+    return _invoke
 
 
 @pytest.fixture
-def photozipper_cmd():
+def photozipper_subproc():
     """
-    Returns the command to run photozipper.
+    Returns a callable that runs photozipper in a fresh interpreter.
     
-    On Windows, subprocess.run() doesn't automatically find executables
-    in the venv's Scripts directory, so we use 'python -m photozipper'
-    which works reliably across all platforms.
+    Only for tests marked ``subprocess`` that need a real process exit
+    (argparse SystemExit paths); everything else should use run_photozipper.
+    Output is captured as bytes and decoded once as UTF-8 (errors replaced),
+    so results don't depend on the platform's locale encoding. Pass
+    capture=False when only the exit code is checked: output then goes to
+    os.devnull and stdout/stderr are None.
     """
-    return [sys.executable, '-m', 'photozipper']
+    def run(args: list[str], capture: bool = True) -> SimpleNamespace:
+        if capture:
+            proc = subprocess.run([*_BASE_CMD, *args], capture_output=True, bufsize=-1)
+            return SimpleNamespace(
+                returncode=proc.returncode,
+                stdout=proc.stdout.decode("utf-8", "replace"),
+                stderr=proc.stderr.decode("utf-8", "replace"),
+            )
+        proc = subprocess.run(
+            [*_BASE_CMD, *args], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        return SimpleNamespace(returncode=proc.returncode, stdout=None, stderr=None)
+    return run
+
+
+@pytest.fixture(scope="session")
+def vacation_source_tree(tmp_path_factory):
+    """Read-only source dir: three 'vacation_*' files plus 'work_meeting.jpg'."""
+    return _build_source_tree(tmp_path_factory.mktemp("vacation_src"), VACATION_FILES)
+
+
+@pytest.fixture(scope="session")
+def multi_group_source_tree(tmp_path_factory):
+    """Read-only source dir: groups 'set1' and 'set2' (two files each) plus 'keep_this.jpg'."""
+    return _build_source_tree(tmp_path_factory.mktemp("multi_src"), MULTI_GROUP_FILES)
+
+
+@pytest.fixture(scope="session")
+def trip_corpus(tmp_path_factory):
+    """Read-only source dir built from TRIP_FILES."""
+    return _build_source_tree(tmp_path_factory.mktemp("trip_src"), TRIP_FILES)
+
+
+@pytest.fixture(scope="session")
+def unicode_corpus(tmp_path_factory):
+    """Read-only source dir built from UNICODE_FILES."""
+    return _build_source_tree(tmp_path_factory.mktemp("unicode_src"), UNICODE_FILES)
+
+
+@pytest.fixture
+def delete_source_tree(multi_group_source_tree, tmp_path):
+    """Writable per-test copy of multi_group_source_tree for tests that delete originals."""
+    return Path(shutil.copytree(multi_group_source_tree, tmp_path / "source"))
@@ -5,21 +5,12 @@ These tests verify that the CLI enforces required arguments (--source, --pattern
 and returns appropriate error codes when arguments are missing.
 """
 import pytest
-import subprocess
-import sys
-from pathlib import Path
-
-
-def run_photozipper(args: list[str]) -> subprocess.CompletedProcess:
-    """Run photozipper CLI with given arguments."""
-    cmd = [sys.executable, "-m", "photozipper"] + args
-    return subprocess.run(cmd, capture_output=True, text=True)
 
 
 class TestCLIRequiredArguments:
     """Test required argument validation."""
 
-    def test_missing_source_argument(self):
+    def test_missing_source_argument(self, run_photozipper):
         """Missing --source should return exit code 2 with error message."""
         result = run_photozipper(["--pattern", "test", "--output", "/tmp/out"])
         
@@ -27,7 +18,7 @@ class TestCLIRequiredArguments:
         assert "--source" in result.stderr or "source" in result.stderr.lower(), \
             "Error message should mention missing --source"
 
-    def test_missing_pattern_argument(self):
+    def test_missing_pattern_argument(self, run_photozipper):
         """Missing --pattern should return exit code 2 with error message."""
         result = run_photozipper(["--source", "/tmp/src", "--output", "/tmp/out"])
         
@@ -35,7 +26,7 @@ class TestCLIRequiredArguments:
         assert "--pattern" in result.stderr or "pattern" in result.stderr.lower(), \
             "Error message should mention missing --pattern"
 
-    def test_missing_output_argument(self):
+    def test_missing_output_argument(self, run_photozipper):
         """Missing --output should return exit code 2 with error message."""
         result = run_photozipper(["--source", "/tmp/src", "--pattern", "test"])
         
@@ -43,24 +34,20 @@ class TestCLIRequiredArguments:
         assert "--output" in result.stderr or "output" in result.stderr.lower(), \
             "Error message should mention missing --output"
 
-    def test_all_required_arguments_provided(self, tmp_path):
+    def test_all_required_arguments_provided(self, tmp_path, invoke):
         """When all required arguments provided, should attempt to run (not return code 2)."""
         source_dir = tmp_path / "source"
         source_dir.mkdir()
         output_dir = tmp_path / "output"
         
-        result = run_photozipper([
-            "--source", str(source_dir),
-            "--pattern", "test",
-            "--output", str(output_dir)
-        ])
+        result = invoke(source_dir, "test", output_dir)
         
         # Should not return code 2 (validation error)
         # May return 0 (success) or 1 (operation error like no matches)
         assert result.returncode != 2, \
             "Should not return validation error when all required arguments provided"
 
-    def test_help_flag_shows_required_arguments(self):
+    def test_help_flag_shows_required_arguments(self, run_photozipper):
         """Help message should document required arguments."""
         result = run_photozipper(["--help"])
         
@@ -5,141 +5,131 @@ These tests verify that optional flags (--dry-run, --delete-originals, --log-lev
 work correctly and follow the documented contract.
 """
 import pytest
-import subprocess
-import sys
-from pathlib import Path
 
 
-def run_photozipper(args: list[str]) -> subprocess.CompletedProcess:
-    """Run photozipper CLI with given arguments."""
-    cmd = [sys.executable, "-m", "photozipper"] + args
-    return subprocess.run(cmd, capture_output=True, text=True)
+@pytest.fixture(scope="module")
+def empty_source_and_output(tmp_path_factory):
+    """Empty source dir and an output dir shared by flag-acceptance tests.
+    
+    With no matching files the CLI only appends to the log, so runs
+    don't interfere with each other.
+    """
+    root = tmp_path_factory.mktemp("flags")
+    source_dir = root / "source"
+    source_dir.mkdir()
+    return source_dir, root / "output"
 
 
 class TestCLIOptionalFlags:
     """Test optional flag behavior."""
 
-    def test_dry_run_flag_accepted(self, tmp_path):
-        """--dry-run flag should be accepted without error."""
-        source_dir = tmp_path / "source"
-        source_dir.mkdir()
-        output_dir = tmp_path / "output"
-        
-        result = run_photozipper([
-            "--source", str(source_dir),
-            "--pattern", "test",
-            "--output", str(output_dir),
-            "--dry-run"
-        ])
-        
-        # Should not fail with validation error
-        assert result.returncode != 2, "Dry-run flag should be valid"
-
-    def test_delete_originals_flag_accepted(self, tmp_path):
-        """--delete-originals flag should be accepted without error."""
-        source_dir = tmp_path / "source"
-        source_dir.mkdir()
-        output_dir = tmp_path / "output"
+    @pytest.mark.parametrize(
+        "extra_flag", [["--dry-run"], ["--delete-originals"]], ids=["dry-run", "delete-originals"]
+    )
+    def test_optional_flag_accepted(self, empty_source_and_output, invoke, extra_flag):
+        """--dry-run and --delete-originals should each be accepted without error."""
+        source_dir, output_dir = empty_source_and_output
         
-        result = run_photozipper([
-            "--source", str(source_dir),
-            "--pattern", "test",
-            "--output", str(output_dir),
-            "--delete-originals"
-        ])
+        result = invoke(source_dir, "test", output_dir, *extra_flag)
         
         # Should not fail with validation error
-        assert result.returncode != 2, "Delete-originals flag should be valid"
+        assert result.returncode != 2, f"{extra_flag[0]} flag should be valid"
 
-    def test_delete_originals_with_dry_run_error(self, tmp_path):
+    def test_delete_originals_with_dry_run_error(self, tmp_path, invoke):
         """--delete-originals with --dry-run should return error."""
         source_dir = tmp_path / "source"
         source_dir.mkdir()
         output_dir = tmp_path / "output"
         
-        result = run_photozipper([
-            "--source", str(source_dir),
-            "--pattern", "test",
-            "--output", str(output_dir),
-            "--dry-run",
-            "--delete-originals"
-        ])
+        result = invoke(source_dir, "test", output_dir, "--dry-run", "--delete-originals")
         
         assert result.returncode == 1, "Should error when combining --dry-run with --delete-originals"
         assert "dry-run" in result.stderr.lower() or "delete" in result.stderr.lower(), \
             "Error message should explain incompatible flags"
 
-    def test_log_level_debug_accepted(self, tmp_path):
-        """--log-level DEBUG should be accepted."""
+    @pytest.mark.parametrize("level", ["DEBUG", "INFO", "WARNING", "ERROR"])
+    def test_log_level_accepted(self, empty_source_and_output, invoke, level):
+        """Every documented --log-level value should be accepted."""
+        source_dir, output_dir = empty_source_and_output
+        
+        result = invoke(source_dir, "test", output_dir, "--log-level", level)
+        
+        assert result.returncode != 2, f"{level} log level should be valid"
+
+    def test_workers_flag_accepted(self, tmp_path, invoke):
+        """--workers N should be accepted."""
         source_dir = tmp_path / "source"
         source_dir.mkdir()
         output_dir = tmp_path / "output"
         
-        result = run_photozipper([
-            "--source", str(source_dir),
-            "--pattern", "test",
-            "--output", str(output_dir),
-            "--log-level", "DEBUG"
-        ])
+        result = invoke(source_dir, "test", output_dir, "--workers", "4")
         
-        assert result.returncode != 2, "DEBUG log level should be valid"
+        assert result.returncode == 0, "--workers should be valid"
 
-    def test_log_level_info_accepted(self, tmp_path):
-        """--log-level INFO should be accepted."""
+    def test_extension_filters_accepted(self, tmp_path, invoke):
+        """--include-ext and --exclude-ext should filter the scanned files."""
         source_dir = tmp_path / "source"
         source_dir.mkdir()
         output_dir = tmp_path / "output"
+        (source_dir / "test_001.jpg").write_text("fake image")
+        (source_dir / "test_001.xmp").write_text("sidecar")
+        (source_dir / "test_002.tmp").write_text("temp")
+        
+        result = invoke(
+            source_dir, "test", output_dir, "--include-ext", ".jpg,.xmp", "--exclude-ext", "XMP"
+        )
+        
+        assert result.returncode == 0, "Extension filters should be valid"
+        assert [p.name for p in (output_dir / "test").iterdir()] == ["test_001.jpg"]
+    
+    def test_hardlink_flag_accepted(self, tmp_path, invoke):
+        """--hardlink should be accepted and link files into the group folder."""
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        output_dir = tmp_path / "output"
+        (source_dir / "test_001.jpg").write_text("fake image")
         
-        result = run_photozipper([
-            "--source", str(source_dir),
-            "--pattern", "test",
-            "--output", str(output_dir),
-            "--log-level", "INFO"
-        ])
+        result = invoke(source_dir, "test", output_dir, "--hardlink")
         
-        assert result.returncode != 2, "INFO log level should be valid"
-
-    def test_log_level_warning_accepted(self, tmp_path):
-        """--log-level WARNING should be accepted."""
+        assert result.returncode == 0, "--hardlink should be valid"
+        assert (output_dir / "test" / "test_001.jpg").samefile(source_dir / "test_001.jpg")
+    
+    def test_verify_checksum_flag_accepted(self, tmp_path, invoke):
+        """--verify-checksum should be accepted and still copy files."""
         source_dir = tmp_path / "source"
         source_dir.mkdir()
         output_dir = tmp_path / "output"
+        (source_dir / "test_001.jpg").write_text("fake image")
         
-        result = run_photozipper([
-            "--source", str(source_dir),
-            "--pattern", "test",
-            "--output", str(output_dir),
-            "--log-level", "WARNING"
-        ])
+        result = invoke(source_dir, "test", output_dir, "--verify-checksum")
         
-        assert result.returncode != 2, "WARNING log level should be valid"
-
-    def test_log_level_error_accepted(self, tmp_path):
-        """--log-level ERROR should be accepted."""
+        assert result.returncode == 0, "--verify-checksum should be valid"
+        assert (output_dir / "test" / "test_001.jpg").read_text() == "fake image"
+    
+    def test_workers_below_one_rejected(self, tmp_path, invoke):
+        """--workers 0 should return an error."""
         source_dir = tmp_path / "source"
         source_dir.mkdir()
         output_dir = tmp_path / "output"
         
-        result = run_photozipper([
-            "--source", str(source_dir),
-            "--pattern", "test",
-            "--output", str(output_dir),
-            "--log-level", "ERROR"
-        ])
+        result = invoke(source_dir, "test", output_dir, "--workers", "0")
         
-        assert result.returncode != 2, "ERROR log level should be valid"
+        assert result.returncode == 1, "Should reject --workers below 1"
+        assert "workers" in result.stderr.lower()
 
-    def test_help_flag_exits_successfully(self):
+    @pytest.mark.subprocess
+    def test_help_flag_exits_successfully(self, photozipper_subproc):
         """--help should show help and exit with code 0."""
-        result = run_photozipper(["--help"])
+        result = photozipper_subproc(["--help"])
         
         assert result.returncode == 0, "Help should exit with code 0"
         assert len(result.stdout) > 0, "Help should print usage information"
         assert "photozipper" in result.stdout.lower(), "Help should mention program name"
 
-    def test_version_flag_exits_successfully(self):
+    @pytest.mark.subprocess
+    def test_version_flag_exits_successfully(self, photozipper_subproc):
         """--version should show version and exit with code 0."""
-        result = run_photozipper(["--version"])
+        result = photozipper_subproc(["--version"])
         
         assert result.returncode == 0, "Version should exit with code 0"
         assert len(result.stdout) > 0, "Version should print version information"
@@ -147,17 +137,18 @@ class TestCLIOptionalFlags:
         assert any(char.isdigit() for char in result.stdout), \
             "Version output should contain version number"
 
-    def test_invalid_log_level_rejected(self, tmp_path):
+    @pytest.mark.subprocess
+    def test_invalid_log_level_rejected(self, tmp_path, photozipper_subproc):
         """Invalid log level should return error."""
         source_dir = tmp_path / "source"
         source_dir.mkdir()
         output_dir = tmp_path / "output"
         
-        result = run_photozipper([
+        result = photozipper_subproc([
             "--source", str(source_dir),
             "--pattern", "test",
             "--output", str(output_dir),
             "--log-level", "INVALID"
-        ])
+        ], capture=False)
         
         assert result.returncode != 0, "Invalid log level should be rejected"
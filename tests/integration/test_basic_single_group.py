@@ -3,12 +3,10 @@ Integration test for basic organization with single group.
 Based on Scenario 1 from quickstart.md.
 """
 import pytest
-from pathlib import Path
-import subprocess
 import zipfile
 
 
-def test_basic_single_group_organization(tmpdir, photozipper_cmd):
+def test_basic_single_group_organization(tmp_path, vacation_source_tree, invoke, count_files):
     """
     Scenario 1: Organize photos with a simple prefix pattern into one folder and zip it.
     
@@ -16,40 +14,22 @@ def test_basic_single_group_organization(tmpdir, photozipper_cmd):
     Execute: photozipper --source ./source --pattern "vacation" --output ./output
     Expected: 1 group detected, 1 folder created, 3 files copied, 1 zip created
     """
-    # Setup directories
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    # Create test files
-    (source_dir / "vacation_beach.jpg").write_text("test1")
-    (source_dir / "vacation_sunset.jpg").write_text("test2")
-    (source_dir / "vacation_pool.jpg").write_text("test3")
-    (source_dir / "work_meeting.jpg").write_text("test4")
+    # Shared source tree: 3 vacation files + work_meeting.jpg
+    source_dir = vacation_source_tree
+    output_dir = tmp_path / "output"
     
     # Execute photozipper
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "vacation",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True
-    )
+    result = invoke(source_dir, "vacation", output_dir)
     
     # Verify output message
     assert "vacation" in result.stdout.lower(), "Should detect vacation group"
     
     # Verify folder created
     vacation_folder = output_dir / "vacation"
-    assert vacation_folder.exists(), "vacation folder should be created"
-    assert vacation_folder.is_dir(), "vacation should be a directory"
+    assert vacation_folder.is_dir(), "vacation folder should be created"
     
     # Verify files copied
-    files_in_folder = list(vacation_folder.glob("*.jpg"))
-    assert len(files_in_folder) == 3, "Should copy 3 vacation files"
+    assert count_files(vacation_folder) == 3, "Should copy 3 vacation files"
     
     # Verify specific files exist
     assert (vacation_folder / "vacation_beach.jpg").exists()
@@ -66,10 +46,11 @@ def test_basic_single_group_organization(tmpdir, photozipper_cmd):
     # Verify zip contents
     with zipfile.ZipFile(zip_file, 'r') as zf:
         zip_contents = zf.namelist()
-        assert len(zip_contents) == 3, "Zip should contain 3 files"
-        assert any("vacation_beach.jpg" in name for name in zip_contents)
-        assert any("vacation_sunset.jpg" in name for name in zip_contents)
-        assert any("vacation_pool.jpg" in name for name in zip_contents)
+    assert len(zip_contents) == 3, "Zip should contain 3 files"
+    basenames = {name.rsplit("/", 1)[-1] for name in zip_contents}
+    assert "vacation_beach.jpg" in basenames
+    assert "vacation_sunset.jpg" in basenames
+    assert "vacation_pool.jpg" in basenames
     
     # Verify log file created
     log_file = output_dir / "photozipper.log"
@@ -79,57 +60,66 @@ def test_basic_single_group_organization(tmpdir, photozipper_cmd):
     assert result.returncode == 0, "Should exit with code 0"
 
 
-def test_single_group_file_contents_preserved(tmpdir, photozipper_cmd):
+def test_single_group_file_contents_preserved(tmp_path, vacation_source_tree, invoke):
     """Verify file contents are preserved during copy."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    # Create test file with specific content
-    test_content = "This is important photo data"
-    (source_dir / "vacation_test.jpg").write_text(test_content)
+    source_dir = vacation_source_tree
+    output_dir = tmp_path / "output"
     
     # Execute
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "vacation",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True
-    )
+    result = invoke(source_dir, "vacation", output_dir)
     
     # Verify content preserved
-    copied_file = output_dir / "vacation" / "vacation_test.jpg"
-    assert copied_file.exists()
-    assert copied_file.read_text() == test_content
+    for source_file in source_dir.glob("vacation_*.jpg"):
+        copied_file = output_dir / "vacation" / source_file.name
+        assert copied_file.read_bytes() == source_file.read_bytes()
 
 
-def test_single_group_log_file_contents(tmpdir, photozipper_cmd):
+def test_single_group_log_file_contents(tmp_path, vacation_source_tree, invoke, read_log):
     """Verify log file contains operation details."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    (source_dir / "test_file.jpg").write_text("data")
+    output_dir = tmp_path / "output"
     
     # Execute
-    subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "test",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True
-    )
-    
-    # Verify log file has content
-    log_file = output_dir / "photozipper.log"
-    log_content = log_file.read_text()
+    invoke(vacation_source_tree, "work", output_dir)
+    
+    # Verify log file has content (reading it also proves it exists)
+    log_content = read_log(output_dir)
     
     assert len(log_content) > 0, "Log file should have content"
-    assert "test" in log_content.lower(), "Log should mention the group"
+    assert "work" in log_content.lower(), "Log should mention the group"
+
+
+def test_zip_only_writes_archive_without_folder(tmp_path, vacation_source_tree, invoke):
+    """
+    With --zip-only the archive is built straight from the source files.
+    
+    Expected: vacation.zip holds all vacation files, no vacation folder remains,
+    and the source files are untouched.
+    """
+    source_dir = vacation_source_tree
+    output_dir = tmp_path / "output"
+    
+    result = invoke(source_dir, "vacation", output_dir, "--zip-only")
+    
+    assert result.returncode == 0, "Should exit with code 0"
+    assert "Successfully organized 3 files" in result.stdout
+    assert not (output_dir / "vacation").exists(), "No intermediate folder should remain"
+    
+    with zipfile.ZipFile(output_dir / "vacation.zip", 'r') as zf:
+        assert sorted(zf.namelist()) == [
+            "vacation_beach.jpg", "vacation_pool.jpg", "vacation_sunset.jpg"
+        ]
+        assert zf.read("vacation_beach.jpg") == b"test1"
+    
+    assert (source_dir / "vacation_beach.jpg").exists(), "Sources should be kept"
+
+
+def test_output_directory_created_on_demand(tmp_path, vacation_source_tree, invoke):
+    """The CLI should create a missing (nested) output directory itself."""
+    output_dir = tmp_path / "archive" / "2024" / "output"
+    assert not output_dir.parent.exists()
+    
+    result = invoke(vacation_source_tree, "vacation", output_dir)
+    
+    assert result.returncode == 0
+    assert output_dir.is_dir(), "Output directory should be created"
+    assert (output_dir / "vacation.zip").exists()
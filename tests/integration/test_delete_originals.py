@@ -3,11 +3,9 @@ Integration test for delete originals functionality.
 Based on Scenario 6 from quickstart.md.
 """
 import pytest
-from pathlib import Path
-import subprocess
 
 
-def test_delete_originals_after_successful_copy(tmpdir, photozipper_cmd):
+def test_delete_originals_after_successful_copy(tmp_path, delete_source_tree, invoke):
     """
     Scenario 6: Verify --delete-originals flag safely removes source files.
     
@@ -15,41 +13,26 @@ def test_delete_originals_after_successful_copy(tmpdir, photozipper_cmd):
     Execute: photozipper with --delete-originals
     Expected: Files deleted from source, exist in output and zip
     """
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    # Create test files
-    (source_dir / "delete_test1.jpg").write_text("del1")
-    (source_dir / "delete_test2.jpg").write_text("del2")
+    source_dir = delete_source_tree
+    output_dir = tmp_path / "output"
     
     # Verify source files exist
-    assert (source_dir / "delete_test1.jpg").exists()
-    assert (source_dir / "delete_test2.jpg").exists()
+    assert (source_dir / "set1_a.jpg").exists()
+    assert (source_dir / "set1_b.jpg").exists()
     
     # Execute with --delete-originals
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "delete",
-            "--output", str(output_dir),
-            "--delete-originals"
-        ],
-        capture_output=True,
-        text=True
-    )
+    result = invoke(source_dir, "set1", output_dir, "--delete-originals")
     
     # Verify source files deleted
-    assert not (source_dir / "delete_test1.jpg").exists(), "Original should be deleted"
-    assert not (source_dir / "delete_test2.jpg").exists(), "Original should be deleted"
+    assert not (source_dir / "set1_a.jpg").exists(), "Original should be deleted"
+    assert not (source_dir / "set1_b.jpg").exists(), "Original should be deleted"
     
     # Verify copied files exist
-    assert (output_dir / "delete" / "delete_test1.jpg").exists()
-    assert (output_dir / "delete" / "delete_test2.jpg").exists()
+    assert (output_dir / "set1" / "set1_a.jpg").exists()
+    assert (output_dir / "set1" / "set1_b.jpg").exists()
     
     # Verify zip exists
-    assert (output_dir / "delete.zip").exists()
+    assert (output_dir / "set1.zip").exists()
     
     # Verify output mentions deletion
     output = result.stdout.lower()
@@ -58,123 +41,58 @@ def test_delete_originals_after_successful_copy(tmpdir, photozipper_cmd):
     assert result.returncode == 0
 
 
-def test_delete_originals_preserves_content(tmpdir, photozipper_cmd):
+def test_delete_originals_preserves_content(tmp_path, delete_source_tree, invoke):
     """Verify content is preserved after delete."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    # Create file with specific content
-    test_content = "Important data that must be preserved"
-    (source_dir / "important.jpg").write_text(test_content)
+    source_dir = delete_source_tree
+    output_dir = tmp_path / "output"
     
     # Execute with --delete-originals
-    subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "important",
-            "--output", str(output_dir),
-            "--delete-originals"
-        ],
-        capture_output=True,
-        text=True
-    )
-    
-    # Verify original deleted
-    assert not (source_dir / "important.jpg").exists()
-    
-    # Verify copy has correct content
-    copied_file = output_dir / "important" / "important.jpg"
-    assert copied_file.exists()
-    assert copied_file.read_text() == test_content
+    invoke(source_dir, "set2", output_dir, "--delete-originals")
+    
+    # Verify originals deleted
+    assert not (source_dir / "set2_c.jpg").exists()
+    assert not (source_dir / "set2_d.jpg").exists()
+    
+    # Verify copies have correct content
+    assert (output_dir / "set2" / "set2_c.jpg").read_bytes() == b"2c"
+    assert (output_dir / "set2" / "set2_d.jpg").read_bytes() == b"2d"
 
 
-def test_delete_originals_reports_count(tmpdir, photozipper_cmd):
+def test_delete_originals_reports_count(tmp_path, delete_source_tree, invoke):
     """Verify deletion count is reported."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    # Create multiple files
-    (source_dir / "count_1.jpg").write_text("1")
-    (source_dir / "count_2.jpg").write_text("2")
-    (source_dir / "count_3.jpg").write_text("3")
+    output_dir = tmp_path / "output"
     
     # Execute
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "count",
-            "--output", str(output_dir),
-            "--delete-originals"
-        ],
-        capture_output=True,
-        text=True
-    )
+    result = invoke(delete_source_tree, r"set\d", output_dir, "--delete-originals")
     
     # Output should report number of deletions
-    output = result.stdout.lower()
-    assert "3" in output or "three" in output.lower()
+    assert "(4 deleted)" in result.stdout
 
 
-def test_delete_originals_only_matched_files(tmpdir, photozipper_cmd):
+def test_delete_originals_only_matched_files(tmp_path, delete_source_tree, invoke):
     """Verify only matched files are deleted."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    # Create matched and unmatched files
-    (source_dir / "remove_a.jpg").write_text("a")
-    (source_dir / "remove_b.jpg").write_text("b")
-    (source_dir / "keep_this.jpg").write_text("keep")
-    
-    # Execute - only delete "remove" pattern
-    subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "remove",
-            "--output", str(output_dir),
-            "--delete-originals"
-        ],
-        capture_output=True,
-        text=True
-    )
+    source_dir = delete_source_tree
+    output_dir = tmp_path / "output"
+    
+    # Execute - only delete "set1" pattern
+    invoke(source_dir, "set1", output_dir, "--delete-originals")
     
     # Verify matched files deleted
-    assert not (source_dir / "remove_a.jpg").exists()
-    assert not (source_dir / "remove_b.jpg").exists()
+    assert not (source_dir / "set1_a.jpg").exists()
+    assert not (source_dir / "set1_b.jpg").exists()
     
-    # Verify unmatched file preserved
+    # Verify unmatched files preserved
+    assert (source_dir / "set2_c.jpg").exists(), "Non-matched files should remain"
     assert (source_dir / "keep_this.jpg").exists(), "Non-matched files should remain"
 
 
-def test_delete_originals_multiple_groups(tmpdir, photozipper_cmd):
+def test_delete_originals_multiple_groups(tmp_path, delete_source_tree, invoke):
     """Verify delete works correctly with multiple groups."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    # Create files for multiple groups
-    (source_dir / "set1_a.jpg").write_text("1a")
-    (source_dir / "set1_b.jpg").write_text("1b")
-    (source_dir / "set2_c.jpg").write_text("2c")
-    (source_dir / "set2_d.jpg").write_text("2d")
+    source_dir = delete_source_tree
+    output_dir = tmp_path / "output"
     
     # Execute
-    subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", r"set\d",
-            "--output", str(output_dir),
-            "--delete-originals"
-        ],
-        capture_output=True,
-        text=True
-    )
+    invoke(source_dir, r"set\d", output_dir, "--delete-originals")
     
     # All matched files should be deleted
     assert not (source_dir / "set1_a.jpg").exists()
@@ -189,28 +107,16 @@ def test_delete_originals_multiple_groups(tmpdir, photozipper_cmd):
     assert (output_dir / "set2" / "set2_d.jpg").exists()
 
 
-def test_delete_originals_without_flag_preserves_files(tmpdir, photozipper_cmd):
+def test_delete_originals_without_flag_preserves_files(tmp_path, multi_group_source_tree, invoke):
     """Verify files are NOT deleted without --delete-originals flag."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    (source_dir / "keep_me.jpg").write_text("data")
-    
-    # Execute WITHOUT --delete-originals
-    subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "keep",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True
-    )
+    source_dir = multi_group_source_tree
+    output_dir = tmp_path / "output"
+    
+    # Execute WITHOUT --delete-originals (read-only, so the shared tree is fine)
+    invoke(source_dir, "keep", output_dir)
     
     # Original should still exist
-    assert (source_dir / "keep_me.jpg").exists(), "Files should be preserved by default"
+    assert (source_dir / "keep_this.jpg").exists(), "Files should be preserved by default"
     
     # Copy should also exist
-    assert (output_dir / "keep" / "keep_me.jpg").exists()
+    assert (output_dir / "keep" / "keep_this.jpg").exists()
@@ -2,34 +2,24 @@
 Integration test for error handling with invalid inputs.
 Based on Scenarios 8-9 from quickstart.md.
 """
+import os
 import pytest
-from pathlib import Path
-import subprocess
 
 
-def test_error_invalid_source_directory(tmpdir, photozipper_cmd):
+def test_error_invalid_source_directory(tmp_path, invoke):
     """
     Scenario 8: Verify proper error message for invalid source directory.
     
     Execute: photozipper with non-existent source
     Expected: Error message, exit code 1
     """
-    output_dir = Path(tmpdir) / "output"
-    output_dir.mkdir()
+    output_dir = tmp_path / "output"
     
     # Use non-existent source directory
-    nonexistent_source = Path(tmpdir) / "nonexistent"
+    nonexistent_source = tmp_path / "nonexistent"
     
     # Execute
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(nonexistent_source),
-            "--pattern", "test",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True
-    )
+    result = invoke(nonexistent_source, "test", output_dir)
     
     # Verify error message
     error_output = result.stderr.lower() + result.stdout.lower()
@@ -40,30 +30,17 @@ def test_error_invalid_source_directory(tmpdir, photozipper_cmd):
     assert result.returncode == 1, "Should exit with code 1 for operation error"
 
 
-def test_error_invalid_regex_pattern(tmpdir, photozipper_cmd):
+def test_error_invalid_regex_pattern(invoke, make_tree):
     """
     Scenario 9: Verify proper error message for malformed regex.
     
     Execute: photozipper with invalid pattern
     Expected: Error message about pattern, exit code 1
     """
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    (source_dir / "test.jpg").write_text("data")
-    
-    # Execute with malformed regex
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "trip[",  # Unclosed bracket - invalid regex
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True
-    )
+    source_dir, output_dir = make_tree({"test.jpg": b""})
+    
+    # Execute with malformed regex (unclosed bracket)
+    result = invoke(source_dir, "trip[", output_dir)
     
     # Verify error message
     error_output = result.stderr.lower() + result.stdout.lower()
@@ -74,25 +51,16 @@ def test_error_invalid_regex_pattern(tmpdir, photozipper_cmd):
     assert result.returncode == 1
 
 
-def test_error_source_is_file_not_directory(tmpdir, photozipper_cmd):
+def test_error_source_is_file_not_directory(tmp_path, invoke):
     """Test error when source is a file instead of directory."""
-    source_file = Path(tmpdir) / "source.txt"
-    output_dir = Path(tmpdir) / "output"
-    output_dir.mkdir()
+    source_file = tmp_path / "source.txt"
+    output_dir = tmp_path / "output"
     
     # Create a file (not directory)
-    source_file.write_text("not a directory")
+    source_file.touch()
     
     # Execute
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_file),
-            "--pattern", "test",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True
-    )
+    result = invoke(source_file, "test", output_dir)
     
     # Should error
     assert result.returncode != 0
@@ -100,38 +68,26 @@ def test_error_source_is_file_not_directory(tmpdir, photozipper_cmd):
     assert "director" in error_output or "invalid" in error_output
 
 
-def test_error_output_directory_creation_fails(tmpdir, photozipper_cmd):
+def test_error_output_directory_creation_fails(tmp_path, invoke, make_tree):
     """Test error handling when output directory cannot be created."""
-    source_dir = Path(tmpdir) / "source"
-    source_dir.mkdir()
-    
-    (source_dir / "test.jpg").write_text("data")
+    source_dir, _ = make_tree({"test.jpg": b""})
     
     # Try to use an invalid path for output (e.g., contains null character on Unix)
     # On Windows, this might behave differently, but the test should still validate error handling
-    invalid_output = Path(tmpdir) / "invalid\x00output"
+    invalid_output = tmp_path / "invalid\x00output"
     
     try:
-        result = subprocess.run(
-            photozipper_cmd + [
-                "--source", str(source_dir),
-                "--pattern", "test",
-                "--output", str(invalid_output)
-            ],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
+        result = invoke(source_dir, "test", invalid_output)
         
         # If it runs, it should error
         # Note: this may not work on all platforms
         # assert result.returncode != 0
-    except (subprocess.TimeoutExpired, OSError, ValueError):
+    except (OSError, ValueError):
         # Expected on some platforms
         pass
 
 
-def test_error_permission_denied_reading_source(tmpdir, photozipper_cmd):
+def test_error_permission_denied_reading_source(invoke, make_tree):
     """Test error handling for permission denied on source."""
     # This test is platform-dependent and may not work everywhere
     # Skip if not on Unix-like system
@@ -139,28 +95,14 @@ def test_error_permission_denied_reading_source(tmpdir, photozipper_cmd):
     if sys.platform == "win32":
         pytest.skip("Permission test not reliable on Windows")
     
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    (source_dir / "test.jpg").write_text("data")
+    source_dir, output_dir = make_tree({"test.jpg": b""})
     
     # Remove read permissions
     import os
     os.chmod(source_dir, 0o000)
     
     try:
-        result = subprocess.run(
-            photozipper_cmd + [
-                "--source", str(source_dir),
-                "--pattern", "test",
-                "--output", str(output_dir)
-            ],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
+        result = invoke(source_dir, "test", output_dir)
         
         # Should error with permission issue
         assert result.returncode != 0
@@ -169,72 +111,57 @@ def test_error_permission_denied_reading_source(tmpdir, photozipper_cmd):
         os.chmod(source_dir, 0o755)
 
 
-def test_error_complex_invalid_pattern(tmpdir, photozipper_cmd):
+@pytest.mark.parametrize("pattern", [
+    "(?P<incomplete",  # Incomplete group
+    "*abc",  # Invalid quantifier
+    "(unclosed",  # Unclosed parenthesis
+], ids=["incomplete-group", "invalid-quantifier", "unclosed-paren"])
+def test_error_complex_invalid_pattern(invoke, pattern, make_tree):
     """Test various invalid regex patterns."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    (source_dir / "test.jpg").write_text("data")
-    
-    invalid_patterns = [
-        "(?P<incomplete",  # Incomplete group
-        "*abc",  # Invalid quantifier
-        "(unclosed",  # Unclosed parenthesis
-    ]
-    
-    for pattern in invalid_patterns:
-        result = subprocess.run(
-            photozipper_cmd + [
-                "--source", str(source_dir),
-                "--pattern", pattern,
-                "--output", str(output_dir)
-            ],
-            capture_output=True,
-            text=True
-        )
-        
-        # Each should fail
-        assert result.returncode != 0, f"Pattern '{pattern}' should be rejected"
+    source_dir, output_dir = make_tree({"test.jpg": b""})
+    
+    result = invoke(source_dir, pattern, output_dir)
+    
+    # Each should fail
+    assert result.returncode != 0, f"Pattern '{pattern}' should be rejected"
 
 
-def test_error_missing_required_argument(tmpdir, photozipper_cmd):
+@pytest.mark.parametrize("args", [
+    ["--pattern", "test", "--output", "/tmp/output"],
+    ["--source", "/tmp/source", "--output", "/tmp/output"],
+    ["--source", "/tmp/source", "--pattern", "test"],
+], ids=["missing-source", "missing-pattern", "missing-output"])
+def test_error_missing_required_argument(run_photozipper, args):
     """Test error when required argument is missing."""
     # This is more of a contract test but validates error handling
-    
-    # Missing --source
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--pattern", "test",
-            "--output", "/tmp/output"
-        ],
-        capture_output=True,
-        text=True
-    )
+    result = run_photozipper(args)
     
     assert result.returncode != 0
+
+
+def test_error_copy_failure_keeps_earlier_group_zips(tmp_path, delete_source_tree, invoke, monkeypatch):
+    """A copy failure in a later group still finishes the ZIPs of groups already copied."""
+    from photozipper import cli
     
-    # Missing --pattern
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", "/tmp/source",
-            "--output", "/tmp/output"
-        ],
-        capture_output=True,
-        text=True
-    )
+    output_dir = tmp_path / "output"
+    real_copy_one = cli._copy_one
+    groups_seen = []
     
-    assert result.returncode != 0
+    def copy_or_fail(source_file, target_path, *args):
+        # Fail every copy once processing has moved past the first group
+        group = os.path.basename(os.path.dirname(target_path))
+        if group not in groups_seen:
+            groups_seen.append(group)
+        if group != groups_seen[0]:
+            return ('fail', False)
+        return real_copy_one(source_file, target_path, *args)
     
-    # Missing --output
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", "/tmp/source",
-            "--pattern", "test"
-        ],
-        capture_output=True,
-        text=True
-    )
+    monkeypatch.setattr(cli, "_copy_one", copy_or_fail)
     
-    assert result.returncode != 0
+    result = invoke(delete_source_tree, r"set\d", output_dir, "--zip-only", "--delete-originals")
+    
+    assert result.returncode == 1
+    first, second = groups_seen
+    assert (output_dir / f"{first}.zip").exists(), "Copied group should still be zipped"
+    assert not (output_dir / first).exists(), "--zip-only folder should be removed once zipped"
+    assert not (output_dir / f"{second}.zip").exists()
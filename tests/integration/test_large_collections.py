@@ -2,46 +2,58 @@
 Integration test for large file collections.
 Based on Scenario 11 from quickstart.md.
 """
+import os
 import pytest
+import shutil
 from pathlib import Path
-import subprocess
-import zipfile
 import time
 
 
-def test_large_file_collection_500_files(tmpdir, photozipper_cmd):
+# Files in the shared bulk_* tree
+BULK_FILE_COUNT = 500
+
+
+def _link_or_copy(src, dst):
+    """copytree copy_function: hard link where possible, else a real copy."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+@pytest.fixture(scope="session")
+def bulk_source_500(tmp_path_factory, make_files):
+    """Read-only source dir of BULK_FILE_COUNT files 'bulk_001.jpg'.. (empty)."""
+    root = tmp_path_factory.mktemp("bulk_src")
+    make_files(root, [(f"bulk_{i:03d}.jpg", b"") for i in range(1, BULK_FILE_COUNT + 1)], workers=8)
+    return root
+
+
+@pytest.fixture
+def bulk_source_copy(bulk_source_500, tmp_path):
+    """Writable per-test copy of bulk_source_500, hard-linked where the filesystem allows."""
+    return Path(shutil.copytree(bulk_source_500, tmp_path / "source", copy_function=_link_or_copy))
+
+
+@pytest.mark.slow
+def test_large_file_collection_500_files(tmp_path, invoke, bulk_source_500, count_files, zip_names):
     """
     Scenario 11: Verify performance with many files.
     
-    Setup: Create 500 files
+    Setup: Shared tree of 500 files
     Execute: photozipper organizes all files
     Expected: All files copied, zip created, completes in reasonable time
     """
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
+    source_dir = bulk_source_500
+    output_dir = tmp_path / "output"
     
-    # Create 500 test files
-    num_files = 500
-    for i in range(1, num_files + 1):
-        filename = f"bulk_{i:03d}.jpg"
-        (source_dir / filename).write_text(f"test{i}")
+    num_files = BULK_FILE_COUNT
     
     # Measure execution time
     start_time = time.time()
     
     # Execute
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "bulk",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True,
-        timeout=60  # 60 second timeout
-    )
+    result = invoke(source_dir, "bulk", output_dir, api=True)
     
     end_time = time.time()
     execution_time = end_time - start_time
@@ -50,18 +62,15 @@ def test_large_file_collection_500_files(tmpdir, photozipper_cmd):
     bulk_folder = output_dir / "bulk"
     assert bulk_folder.exists()
     
-    files_in_output = list(bulk_folder.glob("bulk_*.jpg"))
-    assert len(files_in_output) == num_files, f"Should copy all {num_files} files"
+    assert count_files(bulk_folder) == num_files, f"Should copy all {num_files} files"
     
     # Verify zip created
     zip_file = output_dir / "bulk.zip"
     assert zip_file.exists()
     
     # Verify zip contains all files
-    with zipfile.ZipFile(zip_file, 'r') as zf:
-        zip_contents = zf.namelist()
-        jpg_files = [name for name in zip_contents if ".jpg" in name]
-        assert len(jpg_files) == num_files, f"Zip should contain all {num_files} files"
+    jpg_count = sum(1 for name in zip_names(zip_file) if name.endswith(".jpg"))
+    assert jpg_count == num_files, f"Zip should contain all {num_files} files"
     
     # Performance check - should complete in reasonable time (< 30 seconds)
     assert execution_time < 30.0, f"Should complete in < 30s (took {execution_time:.2f}s)"
@@ -70,140 +79,79 @@ def test_large_file_collection_500_files(tmpdir, photozipper_cmd):
     assert result.returncode == 0
 
 
-def test_large_collection_multiple_groups(tmpdir, photozipper_cmd):
+@pytest.mark.slow
+def test_large_collection_multiple_groups(invoke, make_tree, count_files):
     """Test large collection distributed across multiple groups."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
     # Create 200 files across 4 groups (50 each)
     num_groups = 4
     files_per_group = 50
     
-    for group_num in range(1, num_groups + 1):
-        for file_num in range(1, files_per_group + 1):
-            filename = f"group{group_num}_{file_num:03d}.jpg"
-            (source_dir / filename).write_text(f"g{group_num}f{file_num}")
+    source_dir, output_dir = make_tree([
+        (f"group{group_num}_{file_num:03d}.jpg", b"")
+        for group_num in range(1, num_groups + 1)
+        for file_num in range(1, files_per_group + 1)
+    ])
     
     # Execute
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", r"group\d",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True,
-        timeout=30
-    )
+    result = invoke(source_dir, r"group\d", output_dir, api=True)
     
     # Verify all groups created
     for group_num in range(1, num_groups + 1):
         group_folder = output_dir / f"group{group_num}"
         assert group_folder.exists()
         
-        files = list(group_folder.glob("*.jpg"))
-        assert len(files) == files_per_group
+        assert count_files(group_folder) == files_per_group
     
     # Verify all zips created
-    zip_files = list(output_dir.glob("*.zip"))
-    assert len(zip_files) == num_groups
+    assert count_files(output_dir, ".zip") == num_groups
     
     assert result.returncode == 0
 
 
-def test_large_files_with_progress_output(tmpdir, photozipper_cmd):
+def test_large_files_with_progress_output(tmp_path, invoke, bulk_source_500):
     """Verify progress updates shown during large operation."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    # Create 100 files
-    for i in range(1, 101):
-        (source_dir / f"progress_{i:03d}.jpg").write_text(str(i))
+    source_dir = bulk_source_500
+    output_dir = tmp_path / "output"
     
     # Execute
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "progress",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True,
-        timeout=30
-    )
+    result = invoke(source_dir, "bulk", output_dir, api=True)
     
     # Output should show progress or completion message
     output = result.stdout.lower()
     # Look for progress indicators or file count
-    assert "100" in output or "progress" in output or "complete" in output
+    assert str(BULK_FILE_COUNT) in output or "progress" in output or "complete" in output
 
 
-def test_large_collection_with_delete_originals(tmpdir, photozipper_cmd):
+def test_large_collection_with_delete_originals(tmp_path, invoke, bulk_source_copy, count_files):
     """Test large collection with --delete-originals flag."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
+    source_dir = bulk_source_copy
+    output_dir = tmp_path / "output"
     
-    # Create 100 files
-    num_files = 100
-    for i in range(1, num_files + 1):
-        (source_dir / f"del_{i:03d}.jpg").write_text(str(i))
+    num_files = BULK_FILE_COUNT
     
     # Execute with delete flag
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "del",
-            "--output", str(output_dir),
-            "--delete-originals"
-        ],
-        capture_output=True,
-        text=True,
-        timeout=30
-    )
+    result = invoke(source_dir, "bulk", output_dir, api=True, delete_originals=True)
     
     # Verify all source files deleted
-    remaining_files = list(source_dir.glob("del_*.jpg"))
-    assert len(remaining_files) == 0, "All source files should be deleted"
+    assert count_files(source_dir) == 0, "All source files should be deleted"
     
     # Verify all copied to output
-    output_folder = output_dir / "del"
-    copied_files = list(output_folder.glob("del_*.jpg"))
-    assert len(copied_files) == num_files
+    output_folder = output_dir / "bulk"
+    assert count_files(output_folder) == num_files
     
     assert result.returncode == 0
 
 
-def test_large_collection_dry_run_performance(tmpdir, photozipper_cmd):
+@pytest.mark.slow
+def test_large_collection_dry_run_performance(tmp_path, invoke, bulk_source_500):
     """Test dry-run performance with large collection."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    # Create 200 files
-    for i in range(1, 201):
-        (source_dir / f"drytest_{i:03d}.jpg").write_text(str(i))
+    source_dir = bulk_source_500
+    output_dir = tmp_path / "output"
     
     start_time = time.time()
     
     # Execute dry-run
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "drytest",
-            "--output", str(output_dir),
-            "--dry-run"
-        ],
-        capture_output=True,
-        text=True,
-        timeout=30
-    )
+    result = invoke(source_dir, "bulk", output_dir, api=True, dry_run=True)
     
     execution_time = time.time() - start_time
     
@@ -211,76 +159,44 @@ def test_large_collection_dry_run_performance(tmpdir, photozipper_cmd):
     assert execution_time < 5.0, "Dry-run should be fast"
     
     # No files should be created
-    folders = list(output_dir.iterdir())
     # Only log file might exist
-    assert len(folders) <= 1
+    assert len(os.listdir(output_dir)) <= 1
     
     assert result.returncode == 0
 
 
-def test_large_collection_zip_compression(tmpdir, photozipper_cmd):
+def test_large_collection_zip_compression(invoke, make_tree):
     """Verify zip compression with large collection."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    # Create 50 files with compressible content
-    compressible_content = "A" * 1000  # Highly compressible
-    for i in range(1, 51):
-        (source_dir / f"compress_{i:03d}.jpg").write_text(compressible_content)
+    # Create 50 files with compressible content (photo formats are stored
+    # uncompressed, so use a format that gets deflated)
+    compressible_content = b"A" * 1000  # Highly compressible
+    source_dir, output_dir = make_tree([(f"compress_{i:03d}.txt", compressible_content) for i in range(1, 51)])
     
     # Execute
-    subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "compress",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True,
-        timeout=30
-    )
+    invoke(source_dir, "compress", output_dir, api=True)
     
     # Check zip exists
     zip_file = output_dir / "compress.zip"
     assert zip_file.exists()
     
     # Verify compression was applied (zip should be smaller than raw files)
-    raw_size = 50 * len(compressible_content.encode())
+    raw_size = 50 * len(compressible_content)
     zip_size = zip_file.stat().st_size
     
     # Zip should be significantly smaller due to compression
     assert zip_size < raw_size, "Zip should be compressed"
 
 
-def test_very_large_collection_1000_files(tmpdir, photozipper_cmd):
+@pytest.mark.slow
+def test_very_large_collection_1000_files(invoke, make_tree, count_files):
     """Stress test with 1000 files (optional, may be slow)."""
-    # This test is optional and may be skipped in CI
-    pytest.skip("Stress test - enable manually for performance testing")
-    
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
     # Create 1000 files
     num_files = 1000
-    for i in range(1, num_files + 1):
-        (source_dir / f"stress_{i:04d}.jpg").write_text(str(i))
+    source_dir, output_dir = make_tree([(f"stress_{i:04d}.jpg", b"") for i in range(1, num_files + 1)], workers=8)
     
     start_time = time.time()
     
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "stress",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True,
-        timeout=120  # 2 minute timeout for 1000 files
-    )
+    result = invoke(source_dir, "stress", output_dir, api=True)
     
     execution_time = time.time() - start_time
     
@@ -289,7 +205,6 @@ def test_very_large_collection_1000_files(tmpdir, photozipper_cmd):
     
     # Verify file count
     output_folder = output_dir / "stress"
-    copied_files = list(output_folder.glob("*.jpg"))
-    assert len(copied_files) == num_files
+    assert count_files(output_folder) == num_files
     
     print(f"1000 files processed in {execution_time:.2f} seconds")
@@ -3,12 +3,39 @@ Integration test for merge behavior with existing folders.
 Based on Scenario 4 from quickstart.md.
 """
 import pytest
-from pathlib import Path
-import subprocess
-import zipfile
+import shutil
 
 
-def test_merge_skips_duplicate_files(tmpdir, photozipper_cmd):
+@pytest.fixture(scope="module")
+def merged_baseline(tmp_path_factory, invoke):
+    """
+    (source, output) after one run over 'merge_a.jpg'/'merge_b.jpg' with pattern 'merge'.
+    
+    Built once per module and read-only; tests take a copy via merge_state.
+    """
+    root = tmp_path_factory.mktemp("merge_baseline")
+    source_dir = root / "source"
+    output_dir = root / "output"
+    source_dir.mkdir()
+    (source_dir / "merge_a.jpg").write_bytes(b"1")
+    (source_dir / "merge_b.jpg").touch()
+    
+    result = invoke(source_dir, "merge", output_dir)
+    assert result.returncode == 0, result.stderr
+    return source_dir, output_dir
+
+
+@pytest.fixture
+def merge_state(merged_baseline, tmp_path):
+    """Writable per-test copy of merged_baseline (real copies: tests rewrite files in place)."""
+    source_dir, output_dir = merged_baseline
+    return (
+        shutil.copytree(source_dir, tmp_path / "source"),
+        shutil.copytree(output_dir, tmp_path / "output"),
+    )
+
+
+def test_merge_skips_duplicate_files(merge_state, invoke):
     """
     Scenario 4: Merge files into existing folder without overwriting.
     
@@ -16,53 +43,28 @@ def test_merge_skips_duplicate_files(tmpdir, photozipper_cmd):
     Execute: Two photozipper runs with same pattern
     Expected: Duplicate skipped, new file added, original unchanged
     """
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    # First run - create initial files
-    (source_dir / "merge_a.jpg").write_text("1")
-    (source_dir / "merge_b.jpg").write_text("2")
-    
-    subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "merge",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True
-    )
+    source_dir, output_dir = merge_state
     
     # Verify first run created files
     assert (output_dir / "merge" / "merge_a.jpg").exists()
     assert (output_dir / "merge" / "merge_b.jpg").exists()
-    original_content_a = (output_dir / "merge" / "merge_a.jpg").read_text()
+    original_content_a = (output_dir / "merge" / "merge_a.jpg").read_bytes()
     
     # Modify source - add new file and change existing file
-    (source_dir / "merge_c.jpg").write_text("3")
-    (source_dir / "merge_a.jpg").write_text("DIFFERENT")  # Same name, different content
+    (source_dir / "merge_c.jpg").write_bytes(b"3")
+    (source_dir / "merge_a.jpg").write_bytes(b"DIFFERENT")  # Same name, different content
     
     # Second run - should merge
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "merge",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True
-    )
+    result = invoke(source_dir, "merge", output_dir)
     
     # Verify new file added
     assert (output_dir / "merge" / "merge_c.jpg").exists()
-    assert (output_dir / "merge" / "merge_c.jpg").read_text() == "3"
+    assert (output_dir / "merge" / "merge_c.jpg").read_bytes() == b"3"
     
     # Verify original merge_a.jpg unchanged
-    current_content_a = (output_dir / "merge" / "merge_a.jpg").read_text()
+    current_content_a = (output_dir / "merge" / "merge_a.jpg").read_bytes()
     assert current_content_a == original_content_a, "Original file should not be overwritten"
-    assert current_content_a == "1", "Should still contain original content"
+    assert current_content_a == b"1", "Should still contain original content"
     
     # Verify warning about duplicate
     output = result.stdout.lower() + result.stderr.lower()
@@ -71,122 +73,66 @@ def test_merge_skips_duplicate_files(tmpdir, photozipper_cmd):
     assert result.returncode == 0
 
 
-def test_merge_updates_zip_with_new_files(tmpdir, photozipper_cmd):
+def test_merge_updates_zip_with_new_files(merge_state, invoke, zip_names):
     """Verify zip is updated when new files are added."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    # First run
-    (source_dir / "data_x.jpg").write_text("x")
-    
-    subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "data",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True
-    )
+    source_dir, output_dir = merge_state
     
     # Check initial zip
-    zip_path = output_dir / "data.zip"
-    with zipfile.ZipFile(zip_path, 'r') as zf:
-        initial_files = zf.namelist()
-        assert len(initial_files) == 1
+    zip_path = output_dir / "merge.zip"
+    assert len(zip_names(zip_path)) == 2
     
     # Add new file
-    (source_dir / "data_y.jpg").write_text("y")
+    (source_dir / "merge_y.jpg").touch()
     
     # Second run
-    subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "data",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True
-    )
+    invoke(source_dir, "merge", output_dir)
     
     # Check updated zip
-    with zipfile.ZipFile(zip_path, 'r') as zf:
-        updated_files = zf.namelist()
-        # Should now contain both files
-        assert len(updated_files) >= 1, "Zip should be updated with new files"
-        assert any("data_y.jpg" in name for name in updated_files)
+    updated_files = zip_names(zip_path)
+    # Should now contain the new file as well
+    assert len(updated_files) == 3, "Zip should be updated with new files"
+    assert any("merge_y.jpg" in name for name in updated_files)
 
 
-def test_merge_preserves_existing_file_count(tmpdir, photozipper_cmd):
+def test_merge_preserves_existing_file_count(merge_state, invoke, count_files):
     """Verify merge doesn't duplicate existing files."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    # Create 3 files
-    (source_dir / "item_1.jpg").write_text("a")
-    (source_dir / "item_2.jpg").write_text("b")
-    (source_dir / "item_3.jpg").write_text("c")
-    
-    # First run
-    subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "item",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True
-    )
+    source_dir, output_dir = merge_state
     
-    files_after_first = list((output_dir / "item").glob("*.jpg"))
-    count_first = len(files_after_first)
+    count_first = count_files(output_dir / "merge")
     
     # Run again with same files (no changes)
-    subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "item",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True
-    )
+    invoke(source_dir, "merge", output_dir)
     
-    files_after_second = list((output_dir / "item").glob("*.jpg"))
-    count_second = len(files_after_second)
+    count_second = count_files(output_dir / "merge")
     
     # Should have same count (no duplicates)
-    assert count_second == count_first == 3
+    assert count_second == count_first == 2
 
 
-def test_merge_with_empty_folder(tmpdir, photozipper_cmd):
+def test_merge_with_empty_folder(invoke, make_tree):
     """Test merge behavior when output folder exists but is empty."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
+    source_dir, output_dir = make_tree({"preset_file.jpg": b""})
     
     # Pre-create empty folder
-    (output_dir / "preset").mkdir()
-    
-    # Create source files
-    (source_dir / "preset_file.jpg").write_text("data")
+    (output_dir / "preset").mkdir(parents=True)
     
     # Execute
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "preset",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True
-    )
+    result = invoke(source_dir, "preset", output_dir)
     
     # Should successfully add file to existing empty folder
     assert (output_dir / "preset" / "preset_file.jpg").exists()
     assert result.returncode == 0
+
+
+def test_merge_zip_only_folds_in_existing_folder(merge_state, invoke, zip_names):
+    """--zip-only over a folder left by an earlier run merges it into the ZIP and removes it."""
+    source_dir, output_dir = merge_state
+    (source_dir / "merge_c.jpg").write_bytes(b"3")
+    
+    result = invoke(source_dir, "merge", output_dir, "--zip-only")
+    
+    assert result.returncode == 0, result.stderr
+    assert not (output_dir / "merge").exists(), "Existing folder should be removed once zipped"
+    assert sorted(zip_names(output_dir / "merge.zip")) == [
+        "merge_a.jpg", "merge_b.jpg", "merge_c.jpg"
+    ]
@@ -2,14 +2,17 @@
 Integration test for multiple groups auto-detection.
 Based on Scenario 2 from quickstart.md.
 """
+import os
+import subprocess
+import sys
 import pytest
 from pathlib import Path
-import subprocess
-import zipfile
 
+import photozipper
 
-def test_multiple_groups_auto_detection(tmpdir, photozipper_cmd):
-    """
+
+def test_multiple_groups_auto_detection(tmp_path, invoke, trip_corpus, count_files, zip_names):
+    r"""
     Scenario 2: Automatically detect and organize multiple groups in one command.
     
     Setup: Files with patterns trip2004, trip2005, trip2006
@@ -17,29 +20,11 @@ def test_multiple_groups_auto_detection(tmpdir, photozipper_cmd):
     Expected: 3 groups detected, 3 folders created, 3 zips created
     """
     # Setup
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    # Create test files
-    (source_dir / "trip2004_01.jpg").write_text("a")
-    (source_dir / "trip2004_02.jpg").write_text("b")
-    (source_dir / "trip2004_03.jpg").write_text("c")
-    (source_dir / "trip2005_01.jpg").write_text("d")
-    (source_dir / "trip2005_02.jpg").write_text("e")
-    (source_dir / "trip2006_01.jpg").write_text("f")
+    source_dir = trip_corpus
+    output_dir = tmp_path / "output"
     
     # Execute
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", r"trip\d{4}",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True
-    )
+    result = invoke(source_dir, r"trip\d{4}", output_dir)
     
     # Verify output message mentions all groups
     output_lower = result.stdout.lower()
@@ -57,9 +42,9 @@ def test_multiple_groups_auto_detection(tmpdir, photozipper_cmd):
     assert trip2006_folder.exists() and trip2006_folder.is_dir()
     
     # Verify file counts per folder
-    assert len(list(trip2004_folder.glob("*.jpg"))) == 3, "trip2004 should have 3 files"
-    assert len(list(trip2005_folder.glob("*.jpg"))) == 2, "trip2005 should have 2 files"
-    assert len(list(trip2006_folder.glob("*.jpg"))) == 1, "trip2006 should have 1 file"
+    assert count_files(trip2004_folder) == 3, "trip2004 should have 3 files"
+    assert count_files(trip2005_folder) == 2, "trip2005 should have 2 files"
+    assert count_files(trip2006_folder) == 1, "trip2006 should have 1 file"
     
     # Verify specific files exist
     assert (trip2004_folder / "trip2004_01.jpg").exists()
@@ -78,43 +63,20 @@ def test_multiple_groups_auto_detection(tmpdir, photozipper_cmd):
     assert zip2005.exists(), "trip2005.zip should be created"
     assert zip2006.exists(), "trip2006.zip should be created"
     
-    # Verify zip contents
-    with zipfile.ZipFile(zip2004, 'r') as zf:
-        assert len(zf.namelist()) == 3, "trip2004.zip should contain 3 files"
-    
-    with zipfile.ZipFile(zip2005, 'r') as zf:
-        assert len(zf.namelist()) == 2, "trip2005.zip should contain 2 files"
-    
-    with zipfile.ZipFile(zip2006, 'r') as zf:
-        assert len(zf.namelist()) == 1, "trip2006.zip should contain 1 file"
+    # Verify zip contents: 3, 2 and 1 members respectively
+    assert [len(zip_names(z)) for z in (zip2004, zip2005, zip2006)] == [3, 2, 1]
     
     # Verify exit code
     assert result.returncode == 0
 
 
-def test_multiple_groups_with_mixed_patterns(tmpdir, photozipper_cmd):
+def test_multiple_groups_with_mixed_patterns(tmp_path, invoke, trip_corpus):
     """Test multiple groups with different year lengths."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    # Create files with various year patterns
-    (source_dir / "event2020_a.jpg").write_text("1")
-    (source_dir / "event2021_b.jpg").write_text("2")
-    (source_dir / "event2022_c.jpg").write_text("3")
-    (source_dir / "event2023_d.jpg").write_text("4")
+    source_dir = trip_corpus
+    output_dir = tmp_path / "output"
     
     # Execute
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", r"event\d{4}",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True
-    )
+    result = invoke(source_dir, r"event\d{4}", output_dir)
     
     # Verify all groups detected
     assert (output_dir / "event2020").exists()
@@ -125,28 +87,85 @@ def test_multiple_groups_with_mixed_patterns(tmpdir, photozipper_cmd):
     assert result.returncode == 0
 
 
-def test_multiple_groups_file_contents_preserved(tmpdir, photozipper_cmd):
+def test_multiple_groups_file_contents_preserved(tmp_path, invoke, trip_corpus):
     """Verify file contents preserved across multiple groups."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    # Create files with specific content
-    (source_dir / "group1_file.jpg").write_text("content1")
-    (source_dir / "group2_file.jpg").write_text("content2")
+    source_dir = trip_corpus
+    output_dir = tmp_path / "output"
     
     # Execute
-    subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", r"group\d",
-            "--output", str(output_dir)
+    invoke(source_dir, r"group\d", output_dir)
+    
+    # Verify contents
+    assert (output_dir / "group1" / "group1_file.jpg").read_bytes() == b"content1"
+    assert (output_dir / "group2" / "group2_file.jpg").read_bytes() == b"content2"
+
+
+def test_multiple_groups_log_flushed_per_group(tmp_path, invoke, trip_corpus, read_log, monkeypatch):
+    """The buffered log file is written out as each group starts, not only at the end."""
+    from photozipper import cli
+    
+    output_dir = tmp_path / "output"
+    real_flush = cli.flush_logging
+    logged_before_group = []
+    
+    def flush_spy(logger):
+        real_flush(logger)
+        logged_before_group.append(read_log(output_dir).count("Processing group"))
+    
+    monkeypatch.setattr(cli, "flush_logging", flush_spy)
+    
+    result = invoke(trip_corpus, r"trip\d{4}", output_dir)
+    
+    assert result.returncode == 0
+    # Each flush has written every earlier group's records to disk
+    assert logged_before_group == [0, 1, 2]
+
+
+@pytest.mark.subprocess
+def test_multiple_groups_no_fork_warning(tmp_path, trip_corpus):
+    """Organizing never forks the multi-threaded process (Python 3.12+ warns)."""
+    output_dir = tmp_path / "output"
+    
+    result = subprocess.run(
+        [
+            sys.executable, "-W", "error::DeprecationWarning", "-m", "photozipper",
+            "--source", str(trip_corpus),
+            "--pattern", r"trip\d{4}",
+            "--output", str(output_dir),
         ],
         capture_output=True,
-        text=True
+        text=True,
     )
     
-    # Verify contents
-    assert (output_dir / "group1" / "group1_file.jpg").read_text() == "content1"
-    assert (output_dir / "group2" / "group2_file.jpg").read_text() == "content2"
+    assert result.returncode == 0, result.stderr
+    assert "DeprecationWarning" not in result.stderr
+    assert sorted(p.name for p in output_dir.glob("*.zip")) == [
+        "trip2004.zip", "trip2005.zip", "trip2006.zip"
+    ]
+
+
+@pytest.mark.subprocess
+def test_multiple_groups_unguarded_script(tmp_path, trip_corpus):
+    """A plain script calling photozipper.run() without a __main__ guard runs exactly once."""
+    output_dir = tmp_path / "output"
+    script = tmp_path / "organize.py"
+    script.write_text(
+        "import photozipper\n"
+        "print('script body ran')\n"
+        f"rc = photozipper.run({str(trip_corpus)!r}, r'trip\\d{{4}}', {str(output_dir)!r})\n"
+        "print('rc', rc)\n",
+        encoding="utf-8",
+    )
+    # The package is imported from the source tree, not an installed copy
+    package_root = Path(photozipper.__file__).parent.parent
+    pythonpath = [str(package_root), os.environ.get("PYTHONPATH", "")]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, pythonpath))}
+    
+    result = subprocess.run(
+        [sys.executable, str(script)], capture_output=True, text=True, env=env, cwd=tmp_path
+    )
+    
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.count("script body ran") == 1
+    assert "rc 0" in result.stdout
+    assert len(list(output_dir.glob("*.zip"))) == 3
@@ -2,14 +2,17 @@
 Integration test for Unicode filename support.
 Based on Scenario 10 from quickstart.md.
 """
+import os
 import pytest
-from pathlib import Path
-import subprocess
+import re
 import zipfile
-import sys
 
 
-def test_unicode_filenames_basic(tmpdir, photozipper_cmd):
+# Name fragments expected among the files copied by the basic Unicode test
+UNICODE_FRAGMENTS = re.compile("café|日本語|😀")
+
+
+def test_unicode_filenames_basic(tmp_path, invoke, unicode_corpus):
     """
     Scenario 10: Verify Unicode filenames work correctly.
     
@@ -17,101 +20,56 @@ def test_unicode_filenames_basic(tmpdir, photozipper_cmd):
     Execute: photozipper with pattern matching Unicode
     Expected: Files detected, copied, and zipped with correct names
     """
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
-    # Create files with Unicode names
-    (source_dir / "café_photo.jpg").write_text("test1")
-    (source_dir / "日本語.jpg").write_text("test2")
-    (source_dir / "emoji_😀.jpg").write_text("test3")
+    source_dir = unicode_corpus
+    output_dir = tmp_path / "output"
     
     # Execute with pattern matching Unicode
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "café|日本語|emoji",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True,
-        encoding='utf-8',
-        errors='replace'  # Handle decode errors gracefully on Windows
-    )
+    result = invoke(source_dir, "café|日本語|emoji", output_dir)
     
     # Verify files detected and organized
     # Should create folders for each group
-    folders_created = [d for d in output_dir.iterdir() if d.is_dir()]
-    assert len(folders_created) >= 1, "Should create folders for Unicode groups"
-    
-    # Verify specific files exist in output
-    # Files should be copied with correct names
-    all_files = list(output_dir.rglob("*.jpg"))
-    file_names = [f.name for f in all_files]
-    
-    assert any("café" in name for name in file_names), "Café file should be copied"
-    assert any("日本語" in name for name in file_names), "Japanese file should be copied"
-    assert any("😀" in name for name in file_names), "Emoji file should be copied"
+    with os.scandir(output_dir) as it:
+        folders_created = sum(1 for entry in it if entry.is_dir(follow_symlinks=False))
+    assert folders_created >= 1, "Should create folders for Unicode groups"
+    
+    # Verify specific files exist in output, with correct names; one pass
+    # over the copied files collects every Unicode fragment found
+    found = {
+        m.group()
+        for f in output_dir.rglob("*.jpg")
+        if (m := UNICODE_FRAGMENTS.search(f.name))
+    }
+    assert found == {"café", "日本語", "😀"}, "Café, Japanese and emoji files should be copied"
     
     # Verify exit code
     assert result.returncode == 0
 
 
-def test_unicode_in_folder_names(tmpdir, photozipper_cmd):
+def test_unicode_in_folder_names(make_tree, invoke, count_files):
     """Test Unicode characters in group/folder names."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
     # Create files where the pattern match creates Unicode folder
-    (source_dir / "café_file1.jpg").write_text("a")
-    (source_dir / "café_file2.jpg").write_text("b")
+    source_dir, output_dir = make_tree({"café_file1.jpg": b"a", "café_file2.jpg": b"b"})
     
     # Execute
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "café",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True,
-        encoding='utf-8'
-    )
+    result = invoke(source_dir, "café", output_dir)
     
     # Folder should be created with Unicode name
     cafe_folder = output_dir / "café"
     assert cafe_folder.exists(), "Folder with Unicode name should be created"
     
     # Files should be in the Unicode-named folder
-    files_in_folder = list(cafe_folder.glob("*.jpg"))
-    assert len(files_in_folder) == 2
+    assert count_files(cafe_folder) == 2
 
 
-def test_unicode_in_zip_archives(tmpdir, photozipper_cmd):
+def test_unicode_in_zip_archives(tmp_path, invoke, unicode_corpus):
     """Verify Unicode filenames preserved in zip archives."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
+    source_dir = unicode_corpus
+    output_dir = tmp_path / "output"
     
-    # Create Unicode-named file
     unicode_name = "测试_test.jpg"
-    (source_dir / unicode_name).write_text("data")
     
     # Execute
-    subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "测试",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True,
-        encoding='utf-8'
-    )
+    invoke(source_dir, "测试", output_dir)
     
     # Find created zip
     zip_files = list(output_dir.glob("*.zip"))
@@ -124,13 +82,8 @@ def test_unicode_in_zip_archives(tmpdir, photozipper_cmd):
         assert any("测试" in name or unicode_name in name for name in names)
 
 
-def test_unicode_mixed_scripts(tmpdir, photozipper_cmd):
+def test_unicode_mixed_scripts(make_tree, invoke):
     """Test files with mixed scripts (Latin, Cyrillic, Arabic, etc.)."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
-    source_dir.mkdir()
-    output_dir.mkdir()
-    
     # Create files with various Unicode scripts
     files = [
         "Привет_russian.jpg",  # Cyrillic
@@ -139,55 +92,34 @@ def test_unicode_mixed_scripts(tmpdir, photozipper_cmd):
         "שלום_hebrew.jpg",     # Hebrew
     ]
     
-    for filename in files:
-        try:
-            (source_dir / filename).write_text("data")
-        except (OSError, UnicodeEncodeError):
-            # Skip if filesystem doesn't support this Unicode
-            pytest.skip(f"Filesystem doesn't support Unicode: {filename}")
+    try:
+        source_dir, output_dir = make_tree([(filename, b"data") for filename in files])
+    except (OSError, UnicodeEncodeError) as e:
+        # Skip if filesystem doesn't support this Unicode
+        pytest.skip(f"Filesystem doesn't support Unicode: {e}")
     
     # Execute with broad pattern
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", ".*",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True,
-        encoding='utf-8',
-        errors='replace'  # Handle decode errors gracefully on Windows
-    )
+    result = invoke(source_dir, ".*", output_dir)
     
     # Should handle all files
     assert result.returncode == 0
 
 
-def test_unicode_emoji_sequences(tmpdir, photozipper_cmd):
+def test_unicode_emoji_sequences(tmp_path, invoke):
     """Test complex emoji sequences in filenames."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
+    source_dir = tmp_path / "source"
+    output_dir = tmp_path / "output"
     source_dir.mkdir()
-    output_dir.mkdir()
     
     # Create file with emoji
     emoji_file = "photo_🎉🎊🎈.jpg"
     try:
-        (source_dir / emoji_file).write_text("party")
+        (source_dir / emoji_file).write_bytes(b"party")
     except (OSError, UnicodeEncodeError):
         pytest.skip("Filesystem doesn't support emoji in filenames")
     
     # Execute
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "photo",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True,
-        encoding='utf-8'
-    )
+    result = invoke(source_dir, "photo", output_dir)
     
     # Should handle emoji
     copied_files = list(output_dir.rglob("*.jpg"))
@@ -195,31 +127,21 @@ def test_unicode_emoji_sequences(tmpdir, photozipper_cmd):
     assert result.returncode == 0
 
 
-def test_unicode_normalization(tmpdir, photozipper_cmd):
+def test_unicode_normalization(tmp_path, invoke):
     """Test Unicode normalization (composed vs decomposed forms)."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
+    source_dir = tmp_path / "source"
+    output_dir = tmp_path / "output"
     source_dir.mkdir()
-    output_dir.mkdir()
     
     # Create file with composed Unicode (é as single character)
     composed = "résumé.jpg"
     try:
-        (source_dir / composed).write_text("data")
+        (source_dir / composed).write_bytes(b"data")
     except (OSError, UnicodeEncodeError):
         pytest.skip("Filesystem Unicode issue")
     
     # Execute
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "résumé",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True,
-        encoding='utf-8'
-    )
+    result = invoke(source_dir, "résumé", output_dir)
     
     # Should find and copy the file
     copied_files = list(output_dir.rglob("*.jpg"))
@@ -227,13 +149,12 @@ def test_unicode_normalization(tmpdir, photozipper_cmd):
     assert result.returncode == 0
 
 
-@pytest.mark.skipif(sys.platform == "win32", reason="Windows has filename restrictions")
-def test_unicode_special_characters(tmpdir, photozipper_cmd):
+@pytest.mark.skipif("sys.platform == 'win32'", reason="Windows has filename restrictions")
+def test_unicode_special_characters(tmp_path, invoke):
     """Test Unicode with special/combining characters."""
-    source_dir = Path(tmpdir) / "source"
-    output_dir = Path(tmpdir) / "output"
+    source_dir = tmp_path / "source"
+    output_dir = tmp_path / "output"
     source_dir.mkdir()
-    output_dir.mkdir()
     
     # Files with combining diacritics
     special_files = [
@@ -244,21 +165,12 @@ def test_unicode_special_characters(tmpdir, photozipper_cmd):
     
     for filename in special_files:
         try:
-            (source_dir / filename).write_text("data")
+            (source_dir / filename).write_bytes(b"data")
         except (OSError, UnicodeEncodeError):
             continue
     
     # Execute
-    result = subprocess.run(
-        photozipper_cmd + [
-            "--source", str(source_dir),
-            "--pattern", "test|file|photo",
-            "--output", str(output_dir)
-        ],
-        capture_output=True,
-        text=True,
-        encoding='utf-8'
-    )
+    result = invoke(source_dir, "test|file|photo", output_dir)
     
     # Should handle special characters
     assert result.returncode == 0
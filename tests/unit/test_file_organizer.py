@@ -3,227 +3,331 @@ Unit tests for file organization logic.
 
 These tests verify the file organizer module functions using mocked file operations.
 """
+import errno
+import os
 import pytest
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
 import shutil
 
+from photozipper.file_organizer import (
+    create_folder,
+    copy_file_with_metadata,
+    verify_copy,
+    delete_original,
+    SKIPPED
+)
+
 
-# These imports will fail until implementation exists - that's expected for TDD
-try:
-    from photozipper.file_organizer import (
-        create_folder,
-        copy_file_with_metadata,
-        verify_copy,
-        handle_merge,
-        delete_original
-    )
-except ImportError:
-    # Expected during TDD - tests should fail
-    create_folder = None
-    copy_file_with_metadata = None
-    verify_copy = None
-    handle_merge = None
-    delete_original = None
-
-
-@pytest.mark.skipif(create_folder is None, reason="Module not implemented yet")
 class TestFolderCreation:
     """Test folder creation logic."""
 
-    @patch('pathlib.Path.mkdir')
-    @patch('pathlib.Path.exists')
-    def test_create_new_folder(self, mock_exists, mock_mkdir):
-        """Should create folder if it doesn't exist."""
-        mock_exists.return_value = False
+    def test_create_new_folder(self, tmp_path):
+        """Should create folder, including missing parents, if it doesn't exist."""
+        folder_path = tmp_path / "output" / "vacation"
         
-        folder_path = Path("/fake/output/vacation")
         create_folder(folder_path)
         
-        mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
+        assert folder_path.is_dir()
 
-    @patch('pathlib.Path.mkdir')
-    @patch('pathlib.Path.exists')
-    def test_create_folder_already_exists(self, mock_exists, mock_mkdir):
+    def test_create_folder_already_exists(self, tmp_path):
         """Should not error if folder already exists."""
-        mock_exists.return_value = True
+        folder_path = tmp_path / "vacation"
+        folder_path.mkdir()
+        (folder_path / "photo.jpg").write_bytes(b"photo")
         
-        folder_path = Path("/fake/output/vacation")
         create_folder(folder_path)
         
-        # Should still call mkdir with exist_ok=True
-        mock_mkdir.assert_called_once()
+        # Existing contents are left alone
+        assert (folder_path / "photo.jpg").read_bytes() == b"photo"
 
 
-@pytest.mark.skipif(copy_file_with_metadata is None, reason="Module not implemented yet")
 class TestFileCopyWithMetadata:
     """Test file copying with metadata preservation."""
 
-    @patch('shutil.copy2')
-    def test_copy_file_success(self, mock_copy2):
-        """Should copy file using shutil.copy2 for metadata preservation."""
-        source = Path("/fake/source/photo.jpg")
-        target = Path("/fake/output/vacation/photo.jpg")
-        
-        mock_copy2.return_value = str(target)
+    def test_copy_file_success(self, tmp_path):
+        """Should copy file contents and preserve modification time."""
+        source = tmp_path / "photo.jpg"
+        source.write_bytes(b"photo data" * 100)
+        os.utime(source, (1704110400, 1704110400))
+        target = tmp_path / "copy.jpg"
         
         result = copy_file_with_metadata(source, target)
         
         assert result is True
-        mock_copy2.assert_called_once_with(source, target)
+        assert target.read_bytes() == source.read_bytes()
+        assert target.stat().st_mtime == source.stat().st_mtime
 
-    @patch('shutil.copy2')
-    def test_copy_file_permission_error(self, mock_copy2):
-        """Should handle permission errors gracefully."""
-        source = Path("/fake/source/photo.jpg")
-        target = Path("/fake/output/vacation/photo.jpg")
+    def test_copy_empty_file(self, tmp_path):
+        """Should copy zero-length files."""
+        source = tmp_path / "empty.jpg"
+        source.write_bytes(b"")
+        target = tmp_path / "copy.jpg"
+        
+        assert copy_file_with_metadata(source, target) is True
+        assert target.read_bytes() == b""
+
+    @pytest.mark.skipif("not os.path.isdir('/proc/self/fd')", reason="needs /proc/self/fd")
+    @patch('photozipper.file_organizer._METADATA_BY_FD', False)
+    def test_copy_metadata_fallback_after_close(self, tmp_path):
+        """Without fd-based fchmod/utime, copystat() runs on the closed target."""
+        source = tmp_path / "photo.jpg"
+        source.write_bytes(b"photo data")
+        os.utime(source, (1704110400, 1704110400))
+        target = tmp_path / "copy.jpg"
+        real_copystat = shutil.copystat
+        open_at_copystat = []
+        
+        def copystat_spy(src, dst):
+            fds = os.listdir('/proc/self/fd')
+            open_paths = set()
+            for fd in fds:
+                try:
+                    open_paths.add(os.readlink(f'/proc/self/fd/{fd}'))
+                except OSError:
+                    pass
+            open_at_copystat.append(str(dst) in open_paths)
+            real_copystat(src, dst)
+        
+        with patch('shutil.copystat', side_effect=copystat_spy):
+            result = copy_file_with_metadata(source, target)
         
-        mock_copy2.side_effect = PermissionError("Access denied")
+        assert result is True
+        assert open_at_copystat == [False], "copystat() should run after the target is closed"
+        assert target.stat().st_mtime == source.stat().st_mtime
+
+    @patch('os.copy_file_range', create=True)
+    def test_copy_falls_back_when_copy_file_range_unsupported(self, mock_copy_range, tmp_path):
+        """Should fall back to a buffered copy on EXDEV/ENOSYS."""
+        source = tmp_path / "photo.jpg"
+        source.write_bytes(b"photo data")
+        target = tmp_path / "copy.jpg"
+        
+        mock_copy_range.side_effect = OSError(errno.EXDEV, "Cross-device link")
         
         result = copy_file_with_metadata(source, target)
         
+        assert result is True
+        assert target.read_bytes() == b"photo data"
+
+    @pytest.mark.skipif("not hasattr(os, 'posix_fadvise')", reason="posix_fadvise not available")
+    @patch('os.posix_fadvise')
+    def test_copy_drops_source_from_page_cache(self, mock_fadvise, tmp_path):
+        """Should hint sequential reads and evict the source once verified."""
+        source = tmp_path / "photo.jpg"
+        source.write_bytes(b"photo data")
+        target = tmp_path / "copy.jpg"
+        
+        assert copy_file_with_metadata(source, target) is True
+        
+        advice = [c.args[3] for c in mock_fadvise.call_args_list]
+        assert advice == [os.POSIX_FADV_SEQUENTIAL, os.POSIX_FADV_DONTNEED]
+
+    @patch('photozipper.file_organizer._file_digest')
+    def test_copy_file_verified_by_size_only_by_default(self, mock_digest, tmp_path):
+        """Without verify_checksum the copy is not read back for hashing."""
+        source = tmp_path / "photo.jpg"
+        source.write_bytes(b"photo data")
+        target = tmp_path / "copy.jpg"
+        
+        assert copy_file_with_metadata(source, target) is True
+        mock_digest.assert_not_called()
+
+    def test_copy_file_checksum_verified(self, tmp_path):
+        """verify_checksum=True should copy and verify matching contents."""
+        source = tmp_path / "photo.jpg"
+        source.write_bytes(b"photo data" * 100)
+        target = tmp_path / "copy.jpg"
+        
+        assert copy_file_with_metadata(source, target, verify_checksum=True) is True
+        assert target.read_bytes() == source.read_bytes()
+
+    @patch('photozipper.file_organizer._file_digest')
+    def test_copy_file_checksum_mismatch(self, mock_digest, tmp_path):
+        """Should return False when target contents don't match source."""
+        source = tmp_path / "photo.jpg"
+        source.write_bytes(b"photo data")
+        target = tmp_path / "copy.jpg"
+        
+        mock_digest.return_value = b"target-digest"
+        
+        result = copy_file_with_metadata(source, target, verify_checksum=True)
+        
         assert result is False
+        # The source is hashed during the copy; only the target is read back
+        mock_digest.assert_called_once_with(target)
+        assert not target.exists(), "Unverified copy should not be left behind"
 
-    @patch('shutil.copy2')
-    def test_copy_file_os_error(self, mock_copy2):
-        """Should handle OS errors gracefully."""
-        source = Path("/fake/source/photo.jpg")
-        target = Path("/fake/output/vacation/photo.jpg")
+    @patch('photozipper.file_organizer._file_digest')
+    @patch('photozipper.file_organizer._copy_file_data')
+    def test_copy_file_size_mismatch_skips_hashing(self, mock_copy_data, mock_digest, tmp_path):
+        """A short copy should fail on the size check, before hashing."""
+        source = tmp_path / "photo.jpg"
+        source.write_bytes(b"photo data")
+        target = tmp_path / "copy.jpg"
+        
+        mock_copy_data.side_effect = lambda fsrc, fdst, size, source_hash: fdst.write(b"photo")
         
-        mock_copy2.side_effect = OSError("Disk full")
+        result = copy_file_with_metadata(source, target, verify_checksum=True)
+        
+        assert result is False
+        mock_digest.assert_not_called()
+        assert not target.exists(), "Short copy should not be left behind"
+
+    @pytest.mark.parametrize("error", [PermissionError("Access denied"), OSError("Disk full")])
+    @patch('photozipper.file_organizer._copy_file_data')
+    def test_copy_file_error(self, mock_copy_data, error, tmp_path):
+        """Should handle permission/OS errors gracefully and remove the partial copy."""
+        source = tmp_path / "photo.jpg"
+        source.write_bytes(b"photo data")
+        target = tmp_path / "copy.jpg"
+        
+        mock_copy_data.side_effect = error
         
         result = copy_file_with_metadata(source, target)
         
         assert result is False
+        assert not target.exists(), "Partial copy should not be left behind"
 
 
-@pytest.mark.skipif(verify_copy is None, reason="Module not implemented yet")
-class TestCopyVerification:
-    """Test copy verification logic."""
+class TestHardlink:
+    """Test hard-linking instead of copying."""
 
-    @patch('pathlib.Path.stat')
-    @patch('pathlib.Path.exists')
-    def test_verify_copy_sizes_match(self, mock_exists, mock_stat):
-        """Should return True when source and target sizes match."""
-        source = Path("/fake/source/photo.jpg")
-        target = Path("/fake/output/vacation/photo.jpg")
+    def test_hardlink_shares_inode(self, tmp_path):
+        """Should link the target to the source without copying data."""
+        source = tmp_path / "photo.jpg"
+        source.write_bytes(b"photo data")
+        target = tmp_path / "linked.jpg"
         
-        # Mock exists to return True
-        mock_exists.return_value = True
+        with patch('photozipper.file_organizer._copy_file_data') as mock_copy:
+            result = copy_file_with_metadata(source, target, hardlink=True)
         
-        # Mock stat to return matching sizes
-        source_stat = Mock()
-        source_stat.st_size = 1024567
-        target_stat = Mock()
-        target_stat.st_size = 1024567
+        assert result is True
+        assert os.path.samefile(source, target)
+        mock_copy.assert_not_called()
+
+    def test_hardlink_existing_target_skipped(self, tmp_path):
+        """Should report SKIPPED when the target already exists."""
+        source = tmp_path / "photo.jpg"
+        source.write_bytes(b"new content")
+        target = tmp_path / "existing.jpg"
+        target.write_bytes(b"original content")
         
-        mock_stat.side_effect = [source_stat, target_stat]
+        result = copy_file_with_metadata(source, target, hardlink=True)
         
-        result = verify_copy(source, target)
+        assert result == SKIPPED
+        assert target.read_bytes() == b"original content"
+
+    @patch('os.link')
+    def test_hardlink_cross_device_falls_back_to_copy(self, mock_link, tmp_path):
+        """Should make a verified copy when linking across devices fails."""
+        mock_link.side_effect = OSError(errno.EXDEV, "Invalid cross-device link")
+        source = tmp_path / "photo.jpg"
+        source.write_bytes(b"photo data")
+        target = tmp_path / "copy.jpg"
+        
+        result = copy_file_with_metadata(source, target, hardlink=True)
         
         assert result is True
+        assert target.read_bytes() == b"photo data"
+        assert not os.path.samefile(source, target)
 
-    @patch('pathlib.Path.stat')
-    @patch('pathlib.Path.exists')
-    def test_verify_copy_sizes_differ(self, mock_exists, mock_stat):
-        """Should return False when sizes don't match."""
-        source = Path("/fake/source/photo.jpg")
+
+class TestCopyVerification:
+    """Test copy verification logic."""
+
+    @patch('os.stat')
+    def test_verify_copy_sizes_match(self, mock_stat):
+        """Should return True when target size matches the expected size."""
         target = Path("/fake/output/vacation/photo.jpg")
         
-        # Mock exists to return True
-        mock_exists.return_value = True
+        # Mock stat keyed on path: stat()ing anything but the target fails
+        target_stat = Mock(st_size=1024567)
+        mock_stat.side_effect = {target: target_stat}.__getitem__
         
-        # Mock stat to return different sizes
-        source_stat = Mock()
-        source_stat.st_size = 1024567
-        target_stat = Mock()
-        target_stat.st_size = 1024000  # Different
+        result = verify_copy(1024567, target)
         
-        mock_stat.side_effect = [source_stat, target_stat]
+        assert result is True
+        # Only the target should be stat()ed
+        mock_stat.assert_called_once()
+
+    @patch('os.stat')
+    def test_verify_copy_sizes_differ(self, mock_stat):
+        """Should return False when sizes don't match."""
+        target = Path("/fake/output/vacation/photo.jpg")
+        
+        # Mock stat keyed on path, returning a different size
+        target_stat = Mock(st_size=1024000)
+        mock_stat.side_effect = {target: target_stat}.__getitem__
         
-        result = verify_copy(source, target)
+        result = verify_copy(1024567, target)
         
         assert result is False
 
-    @patch('pathlib.Path.stat')
-    @patch('pathlib.Path.exists')
-    def test_verify_copy_target_missing(self, mock_exists, mock_stat):
+    @patch('os.stat')
+    def test_verify_copy_target_missing(self, mock_stat):
         """Should return False if target doesn't exist."""
-        source = Path("/fake/source/photo.jpg")
         target = Path("/fake/output/vacation/photo.jpg")
         
-        mock_exists.return_value = False
+        mock_stat.side_effect = FileNotFoundError("No such file")
         
-        result = verify_copy(source, target)
+        result = verify_copy(1024567, target)
         
         assert result is False
 
 
-@pytest.mark.skipif(handle_merge is None, reason="Module not implemented yet")
 class TestMergeBehavior:
     """Test merge behavior for existing folders."""
 
-    @patch('pathlib.Path.exists')
-    def test_merge_skip_duplicate_file(self, mock_exists):
-        """Should skip files that already exist in target."""
-        target_path = Path("/fake/output/vacation/photo.jpg")
-        
-        # Mock that target file already exists
-        mock_exists.return_value = True
+    def test_merge_skip_duplicate_file(self, tmp_path):
+        """Should skip files that already exist in target without overwriting."""
+        source = tmp_path / "photo.jpg"
+        source.write_bytes(b"new content")
+        target = tmp_path / "existing.jpg"
+        target.write_bytes(b"original content")
         
-        should_copy, action = handle_merge(target_path)
+        result = copy_file_with_metadata(source, target)
         
-        # Should return False (don't copy) and 'skip' action
-        assert should_copy is False
-        assert action == 'skip'
+        assert result == SKIPPED
+        assert target.read_bytes() == b"original content"
 
-    @patch('pathlib.Path.exists')
-    def test_merge_copy_new_file(self, mock_exists):
+    def test_merge_copy_new_file(self, tmp_path):
         """Should copy files that don't exist in target."""
-        target_path = Path("/fake/output/vacation/new_photo.jpg")
-        
-        # Mock that target file doesn't exist
-        mock_exists.return_value = False
+        source = tmp_path / "photo.jpg"
+        source.write_bytes(b"new content")
+        target = tmp_path / "new_photo.jpg"
         
-        should_copy, action = handle_merge(target_path)
+        result = copy_file_with_metadata(source, target)
         
-        # Should return True (do copy) and 'copy' action
-        assert should_copy is True
-        assert action == 'copy'
+        assert result is True
+        assert target.read_bytes() == b"new content"
 
 
-@pytest.mark.skipif(delete_original is None, reason="Module not implemented yet")
 class TestDeleteOriginal:
     """Test original file deletion after copy."""
 
-    @patch('pathlib.Path.unlink')
-    @patch('pathlib.Path.exists')
-    def test_delete_existing_file(self, mock_exists, mock_unlink):
+    def test_delete_existing_file(self, tmp_path):
         """Should delete file if it exists."""
-        file_path = Path("/fake/source/photo.jpg")
-        mock_exists.return_value = True
+        file_path = tmp_path / "photo.jpg"
+        file_path.write_bytes(b"photo")
         
         result = delete_original(file_path)
         
         assert result is True
-        mock_unlink.assert_called_once()
+        assert not file_path.exists()
 
-    @patch('pathlib.Path.exists')
-    def test_delete_missing_file(self, mock_exists):
+    def test_delete_missing_file(self, tmp_path):
         """Should return False if file doesn't exist."""
-        file_path = Path("/fake/source/photo.jpg")
-        mock_exists.return_value = False
+        file_path = tmp_path / "photo.jpg"
         
         result = delete_original(file_path)
         
         assert result is False
 
     @patch('pathlib.Path.unlink')
-    @patch('pathlib.Path.exists')
-    def test_delete_permission_error(self, mock_exists, mock_unlink):
+    def test_delete_permission_error(self, mock_unlink):
         """Should handle permission errors gracefully."""
         file_path = Path("/fake/source/photo.jpg")
-        mock_exists.return_value = True
         mock_unlink.side_effect = PermissionError("Access denied")
         
         result = delete_original(file_path)
@@ -231,7 +335,6 @@ class TestDeleteOriginal:
         assert result is False
 
 
-@pytest.mark.skipif(create_folder is None, reason="Module not implemented yet")
 class TestDryRunMode:
     """Test that dry-run mode doesn't actually modify files."""
 
@@ -241,13 +344,3 @@ class TestDryRunMode:
         # For now, just verify the concept exists
         pass
 
-
-# Test that module doesn't exist yet (TDD verification)
-def test_module_not_implemented_yet():
-    """Verify that file_organizer module doesn't exist yet (TDD check)."""
-    try:
-        from photozipper import file_organizer
-        pytest.skip("Module already implemented - remove this test")
-    except (ImportError, AttributeError):
-        # Expected - module doesn't exist yet
-        pass
@@ -4,200 +4,124 @@ Unit tests for logging configuration.
 These tests verify the logger module functions and configuration.
 """
 import pytest
-from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import DEFAULT, patch
 import logging
 
+from photozipper.logger import setup_logging, flush_logging, close_logging
 
-# These imports will fail until implementation exists - that's expected for TDD
-try:
-    from photozipper.logger import setup_logging
-except ImportError:
-    # Expected during TDD - tests should fail
-    setup_logging = None
 
+@pytest.fixture
+def fresh_logger():
+    """A standalone Logger, not registered with logging's global manager."""
+    return logging.Logger("photozipper_test")
 
-@pytest.mark.skipif(setup_logging is None, reason="Module not implemented yet")
+
+@patch.multiple('logging', FileHandler=DEFAULT, StreamHandler=DEFAULT)
 class TestLoggingSetup:
     """Test logging configuration and setup."""
 
-    @patch('logging.getLogger')
-    @patch('logging.FileHandler')
-    @patch('logging.StreamHandler')
-    def test_setup_creates_logger(self, mock_stream, mock_file, mock_get_logger):
-        """Should create and configure logger."""
-        output_dir = Path("/fake/output")
-        log_level = "INFO"
-        
-        mock_logger = MagicMock()
-        mock_get_logger.return_value = mock_logger
+    @pytest.mark.parametrize("log_level", ["DEBUG", "INFO", "WARNING", "ERROR"])
+    def test_setup_accepts_log_level(self, log_level, tmp_path, fresh_logger, **mocks):
+        """Should configure the given logger and set the console handler to log_level."""
+        logger = setup_logging(tmp_path, log_level, logger=fresh_logger)
         
-        logger = setup_logging(output_dir, log_level)
-        
-        assert logger is not None
-        mock_get_logger.assert_called_once()
+        assert logger is fresh_logger
+        mocks["StreamHandler"].return_value.setLevel.assert_called_once_with(
+            getattr(logging, log_level)
+        )
 
-    @patch('logging.getLogger')
-    @patch('logging.FileHandler')
-    @patch('logging.StreamHandler')
-    def test_console_handler_info_level(self, mock_stream, mock_file, mock_get_logger):
+    def test_console_handler_info_level(self, tmp_path, fresh_logger, **mocks):
         """Console handler should log at INFO level."""
-        output_dir = Path("/fake/output")
-        log_level = "INFO"
-        
-        mock_logger = MagicMock()
-        mock_get_logger.return_value = mock_logger
-        mock_console_handler = MagicMock()
-        mock_stream.return_value = mock_console_handler
+        mock_console_handler = mocks["StreamHandler"].return_value
         
-        setup_logging(output_dir, log_level)
+        setup_logging(tmp_path, "INFO", logger=fresh_logger)
         
         # Verify console handler created
-        mock_stream.assert_called_once()
+        mocks["StreamHandler"].assert_called_once()
         # Verify INFO level set
-        mock_console_handler.setLevel.assert_called()
+        mock_console_handler.setLevel.assert_called_once_with(logging.INFO)
 
-    @patch('logging.getLogger')
-    @patch('logging.FileHandler')
-    @patch('logging.StreamHandler')
-    def test_file_handler_debug_level(self, mock_stream, mock_file, mock_get_logger):
+    def test_file_handler_debug_level(self, tmp_path, fresh_logger, **mocks):
         """File handler should log at DEBUG level."""
-        output_dir = Path("/fake/output")
-        log_level = "INFO"
+        mock_file_handler = mocks["FileHandler"].return_value
         
-        mock_logger = MagicMock()
-        mock_get_logger.return_value = mock_logger
-        mock_file_handler = MagicMock()
-        mock_file.return_value = mock_file_handler
-        
-        setup_logging(output_dir, log_level)
+        setup_logging(tmp_path, "INFO", logger=fresh_logger)
         
         # Verify file handler created
-        mock_file.assert_called_once()
+        mocks["FileHandler"].assert_called_once()
         # Verify DEBUG level set on file handler
-        mock_file_handler.setLevel.assert_called()
+        mock_file_handler.setLevel.assert_called_once_with(logging.DEBUG)
 
-    @patch('logging.getLogger')
-    @patch('logging.FileHandler')
-    @patch('logging.StreamHandler')
-    def test_log_file_in_output_directory(self, mock_stream, mock_file, mock_get_logger):
+    def test_log_file_in_output_directory(self, tmp_path, fresh_logger, **mocks):
         """Log file should be created in output directory."""
-        output_dir = Path("/fake/output")
-        log_level = "INFO"
-        
-        mock_logger = MagicMock()
-        mock_get_logger.return_value = mock_logger
-        
-        setup_logging(output_dir, log_level)
+        setup_logging(tmp_path, "INFO", logger=fresh_logger)
         
         # Verify file handler called with path in output directory
-        mock_file.assert_called_once()
-        call_args = mock_file.call_args[0]
-        assert "photozipper.log" in str(call_args[0])
-
-    @patch('logging.getLogger')
-    @patch('logging.FileHandler')
-    @patch('logging.StreamHandler')
-    def test_log_format_includes_timestamp(self, mock_stream, mock_file, mock_get_logger):
+        mocks["FileHandler"].assert_called_once()
+        assert mocks["FileHandler"].call_args[0][0] == tmp_path / "photozipper.log"
+
+    def test_log_format_includes_timestamp(self, tmp_path, fresh_logger, **mocks):
         """Log format should include timestamp and level."""
-        output_dir = Path("/fake/output")
-        log_level = "INFO"
-        
-        mock_logger = MagicMock()
-        mock_get_logger.return_value = mock_logger
-        
-        setup_logging(output_dir, log_level)
+        setup_logging(tmp_path, "INFO", logger=fresh_logger)
         
         # Verify formatter set on handlers
         # Format should include timestamp (%(asctime)s) and level (%(levelname)s)
         # This is validated by checking setFormatter was called
-        mock_stream.return_value.setFormatter.assert_called_once()
-        mock_file.return_value.setFormatter.assert_called_once()
-
-    @patch('logging.getLogger')
-    @patch('logging.FileHandler')
-    @patch('logging.StreamHandler')
-    def test_debug_log_level(self, mock_stream, mock_file, mock_get_logger):
-        """Should accept DEBUG log level."""
-        output_dir = Path("/fake/output")
-        log_level = "DEBUG"
-        
-        mock_logger = MagicMock()
-        mock_get_logger.return_value = mock_logger
-        
-        logger = setup_logging(output_dir, log_level)
-        
-        # Should set logger to DEBUG level
-        assert logger is not None
-
-    @patch('logging.getLogger')
-    @patch('logging.FileHandler')
-    @patch('logging.StreamHandler')
-    def test_warning_log_level(self, mock_stream, mock_file, mock_get_logger):
-        """Should accept WARNING log level."""
-        output_dir = Path("/fake/output")
-        log_level = "WARNING"
-        
-        mock_logger = MagicMock()
-        mock_get_logger.return_value = mock_logger
-        
-        logger = setup_logging(output_dir, log_level)
-        
-        assert logger is not None
-
-    @patch('logging.getLogger')
-    @patch('logging.FileHandler')
-    @patch('logging.StreamHandler')
-    def test_error_log_level(self, mock_stream, mock_file, mock_get_logger):
-        """Should accept ERROR log level."""
-        output_dir = Path("/fake/output")
-        log_level = "ERROR"
-        
-        mock_logger = MagicMock()
-        mock_get_logger.return_value = mock_logger
-        
-        logger = setup_logging(output_dir, log_level)
-        
-        assert logger is not None
+        mocks["StreamHandler"].return_value.setFormatter.assert_called_once()
+        mocks["FileHandler"].return_value.setFormatter.assert_called_once()
 
-    @patch('logging.getLogger')
-    @patch('logging.FileHandler')
-    @patch('logging.StreamHandler')
-    def test_multiple_loggers_no_conflict(self, mock_stream, mock_file, mock_get_logger):
+    def test_multiple_loggers_no_conflict(self, tmp_path, **mocks):
         """Multiple logger setups should not conflict."""
-        output_dir1 = Path("/fake/output1")
-        output_dir2 = Path("/fake/output2")
-        
-        mock_logger1 = MagicMock()
-        mock_logger2 = MagicMock()
-        mock_get_logger.side_effect = [mock_logger1, mock_logger2]
-        
-        logger1 = setup_logging(output_dir1, "INFO")
-        logger2 = setup_logging(output_dir2, "DEBUG")
+        logger1 = setup_logging(tmp_path / "output1", "INFO", logger=logging.Logger("one"))
+        logger2 = setup_logging(tmp_path / "output2", "DEBUG", logger=logging.Logger("two"))
         
-        # Both should be created successfully
-        assert logger1 is not None
-        assert logger2 is not None
+        # Each logger gets its own console and buffered file handler
+        assert logger1 is not logger2
+        assert len(logger1.handlers) == 2
+        assert len(logger2.handlers) == 2
 
-    @patch('logging.getLogger')
-    @patch('logging.FileHandler')
-    def test_log_file_creation_error_handled(self, mock_file, mock_get_logger):
+    def test_log_file_creation_error_handled(self, tmp_path, fresh_logger, **mocks):
         """Should handle errors creating log file gracefully."""
-        output_dir = Path("/readonly/output")
-        log_level = "INFO"
-        
-        mock_logger = MagicMock()
-        mock_get_logger.return_value = mock_logger
-        mock_file.side_effect = PermissionError("Cannot create log file")
-        
-        # Should not crash, but may return logger without file handler
-        logger = setup_logging(output_dir, log_level)
-        
-        # Logger should still be created (may just not have file handler)
-        assert logger is not None
+        mocks["StreamHandler"].return_value.level = logging.INFO
+        mocks["FileHandler"].side_effect = PermissionError("Cannot create log file")
+        
+        # Should not crash, but returns the logger without a file handler
+        logger = setup_logging(tmp_path, "INFO", logger=fresh_logger)
+        
+        assert logger.handlers == [mocks["StreamHandler"].return_value]
+
+
+class TestLogBuffering:
+    """Test buffered writes to the log file."""
+
+    def test_records_buffered_until_flush(self, tmp_path):
+        """DEBUG/INFO records should reach the file only when flushed."""
+        logger = setup_logging(tmp_path, "ERROR")
+        log_file = tmp_path / "photozipper.log"
+        try:
+            logger.debug("Copied: photo.jpg")
+            assert "Copied: photo.jpg" not in log_file.read_text(encoding="utf-8")
+            
+            flush_logging(logger)
+            assert "Copied: photo.jpg" in log_file.read_text(encoding="utf-8")
+        finally:
+            close_logging(logger)
+
+    def test_errors_written_immediately(self, tmp_path):
+        """ERROR records should flush the buffer straight away."""
+        logger = setup_logging(tmp_path, "ERROR")
+        log_file = tmp_path / "photozipper.log"
+        try:
+            logger.info("Processing group 'vacation'")
+            logger.error("Copy verification failed: photo.jpg")
+            
+            contents = log_file.read_text(encoding="utf-8")
+            assert "Processing group 'vacation'" in contents
+            assert "Copy verification failed: photo.jpg" in contents
+        finally:
+            close_logging(logger)
 
 
-@pytest.mark.skipif(setup_logging is None, reason="Module not implemented yet")
 class TestLogFormatting:
     """Test log message formatting."""
 
@@ -211,14 +135,3 @@ class TestLogFormatting:
         """Timestamp should be in readable format."""
         # Format should be YYYY-MM-DD HH:MM:SS or similar
         pass
-
-
-# Test that module doesn't exist yet (TDD verification)
-def test_module_not_implemented_yet():
-    """Verify that logger module doesn't exist yet (TDD check)."""
-    try:
-        from photozipper import logger
-        pytest.skip("Module already implemented - remove this test")
-    except (ImportError, AttributeError):
-        # Expected - module doesn't exist yet
-        pass
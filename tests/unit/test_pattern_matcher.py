@@ -3,57 +3,58 @@ Unit tests for pattern matching logic.
 
 These tests verify the pattern matcher module functions using mocked file operations.
 """
+import os
 import pytest
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 import re
 
+from photozipper.pattern_matcher import (
+    validate_pattern,
+    extract_group,
+    scan_and_group,
+    normalize_extensions
+)
 
-# These imports will fail until implementation exists - that's expected for TDD
-try:
-    from photozipper.pattern_matcher import (
-        validate_pattern,
-        extract_group,
-        scan_and_group
-    )
-except ImportError:
-    # Expected during TDD - tests should fail
-    validate_pattern = None
-    extract_group = None
-    scan_and_group = None
 
-
-@pytest.mark.skipif(validate_pattern is None, reason="Module not implemented yet")
 class TestPatternValidation:
     """Test pattern validation logic."""
 
-    def test_simple_string_pattern_valid(self):
-        """Simple string patterns should be valid."""
-        assert validate_pattern("vacation") is True
-
-    def test_regex_pattern_with_digits_valid(self):
-        """Regex patterns with digits should be valid."""
-        assert validate_pattern(r"trip\d{4}") is True
-
-    def test_regex_pattern_with_groups_valid(self):
-        """Regex patterns with groups should be valid."""
-        assert validate_pattern(r"^IMG_\d+") is True
+    @pytest.mark.parametrize("pattern", ["vacation", r"trip\d{4}", r"^IMG_\d+"])
+    def test_valid_patterns(self, pattern):
+        """Plain strings and regexes with digits/anchors should compile."""
+        assert validate_pattern(pattern).pattern == pattern
 
-    def test_invalid_regex_raises_error(self):
-        """Invalid regex should raise ValueError."""
+    @pytest.mark.parametrize("pattern", [
+        pytest.param("trip[", id="unterminated-set"),
+        pytest.param("", id="empty"),
+        pytest.param("   ", id="whitespace"),
+    ])
+    def test_invalid_patterns(self, pattern):
+        """Invalid or empty patterns should raise ValueError."""
         with pytest.raises(ValueError):
-            validate_pattern("trip[")  # Unterminated character set
+            validate_pattern(pattern)
 
-    def test_empty_pattern_raises_error(self):
-        """Empty pattern should raise ValueError."""
-        with pytest.raises(ValueError):
-            validate_pattern("")
+    def test_compiled_pattern_returned_unchanged(self):
+        """A precompiled pattern should be reused, not recompiled."""
+        compiled = re.compile(r"set\d")
+        assert validate_pattern(compiled) is compiled
+
+    def test_repeated_string_pattern_compiled_once(self):
+        """The same pattern string should map to the same compiled pattern."""
+        assert validate_pattern(r"event\d{4}") is validate_pattern(r"event\d{4}")
 
 
-@pytest.mark.skipif(extract_group is None, reason="Module not implemented yet")
 class TestGroupExtraction:
     """Test group name extraction from filenames."""
 
+    @pytest.fixture(scope="class")
+    @classmethod
+    def trip_pattern(cls):
+        """trip + four digits, compiled once for the class."""
+        return re.compile(r"trip\d{4}")
+
     def test_simple_prefix_extraction(self):
         """Simple prefix should be extracted as group name."""
         result = extract_group("vacation_beach.jpg", "vacation")
@@ -64,10 +65,10 @@ class TestGroupExtraction:
         result = extract_group("trip2004_01.jpg", r"trip\d{4}")
         assert result == "trip2004"
 
-    def test_different_groups_same_pattern(self):
+    def test_different_groups_same_pattern(self, trip_pattern):
         """Same pattern should extract different groups from different files."""
-        group1 = extract_group("trip2004_01.jpg", r"trip\d{4}")
-        group2 = extract_group("trip2005_01.jpg", r"trip\d{4}")
+        group1 = extract_group("trip2004_01.jpg", trip_pattern)
+        group2 = extract_group("trip2005_01.jpg", trip_pattern)
         
         assert group1 == "trip2004"
         assert group2 == "trip2005"
@@ -89,26 +90,49 @@ class TestGroupExtraction:
         assert result == "IMG_"
 
 
-@pytest.mark.skipif(scan_and_group is None, reason="Module not implemented yet")
+# Cached stat data shared by every _FakeEntry
+_FAKE_STAT = SimpleNamespace(st_size=1024, st_mtime=1704110400.0)
+
+
+class _FakeEntry:
+    """Plain os.DirEntry stand-in for scans that don't assert on calls."""
+    
+    __slots__ = ("name", "path", "_is_file")
+    
+    def __init__(self, name, is_file=True):
+        self.name = name
+        self.path = f"/fake/source/{name}"
+        self._is_file = is_file
+    
+    def is_file(self, *, follow_symlinks=True):
+        return self._is_file
+    
+    def stat(self, *, follow_symlinks=True):
+        return _FAKE_STAT
+
+
+def _mock_entry(name, is_file=True):
+    """Build a mock os.DirEntry with cached stat data (for call assertions)."""
+    entry = Mock(spec=os.DirEntry)
+    entry.name = name
+    entry.path = f"/fake/source/{name}"
+    entry.is_file.return_value = is_file
+    entry.stat.return_value = Mock(st_size=1024, st_mtime=1704110400.0)
+    return entry
+
+
 class TestScanAndGroup:
     """Test directory scanning and file grouping."""
 
-    @patch('pathlib.Path.iterdir')
-    @patch('pathlib.Path.is_file')
-    def test_single_group_detection(self, mock_is_file, mock_iterdir):
+    @patch('os.scandir')
+    def test_single_group_detection(self, mock_scandir):
         """Files matching same pattern should be grouped together."""
         # Mock directory with files
-        mock_files = [
-            Mock(spec=Path, name="vacation_beach.jpg"),
-            Mock(spec=Path, name="vacation_sunset.jpg"),
-            Mock(spec=Path, name="vacation_pool.jpg"),
+        mock_scandir.return_value.__enter__.return_value = [
+            _FakeEntry("vacation_beach.jpg"),
+            _FakeEntry("vacation_sunset.jpg"),
+            _FakeEntry("vacation_pool.jpg"),
         ]
-        for f in mock_files:
-            f.name = f._mock_name
-            f.is_file.return_value = True
-        
-        mock_iterdir.return_value = mock_files
-        mock_is_file.return_value = True
         
         source_dir = Path("/fake/source")
         groups = scan_and_group(source_dir, "vacation")
@@ -117,22 +141,15 @@ class TestScanAndGroup:
         assert groups[0].name == "vacation"
         assert len(groups[0].files) == 3
 
-    @patch('pathlib.Path.iterdir')
-    @patch('pathlib.Path.is_file')
-    def test_multiple_groups_detection(self, mock_is_file, mock_iterdir):
+    @patch('os.scandir')
+    def test_multiple_groups_detection(self, mock_scandir):
         """Files matching different patterns should create multiple groups."""
-        mock_files = [
-            Mock(spec=Path, name="trip2004_01.jpg"),
-            Mock(spec=Path, name="trip2004_02.jpg"),
-            Mock(spec=Path, name="trip2005_01.jpg"),
-            Mock(spec=Path, name="trip2006_01.jpg"),
+        mock_scandir.return_value.__enter__.return_value = [
+            _FakeEntry("trip2004_01.jpg"),
+            _FakeEntry("trip2004_02.jpg"),
+            _FakeEntry("trip2005_01.jpg"),
+            _FakeEntry("trip2006_01.jpg"),
         ]
-        for f in mock_files:
-            f.name = f._mock_name
-            f.is_file.return_value = True
-        
-        mock_iterdir.return_value = mock_files
-        mock_is_file.return_value = True
         
         source_dir = Path("/fake/source")
         groups = scan_and_group(source_dir, r"trip\d{4}")
@@ -141,39 +158,26 @@ class TestScanAndGroup:
         group_names = {g.name for g in groups}
         assert group_names == {"trip2004", "trip2005", "trip2006"}
 
-    @patch('pathlib.Path.iterdir')
-    @patch('pathlib.Path.is_file')
-    def test_no_matches_returns_empty(self, mock_is_file, mock_iterdir):
+    @patch('os.scandir')
+    def test_no_matches_returns_empty(self, mock_scandir):
         """No matching files should return empty list."""
-        mock_files = [
-            Mock(spec=Path, name="document.pdf"),
-            Mock(spec=Path, name="report.docx"),
+        mock_scandir.return_value.__enter__.return_value = [
+            _FakeEntry("document.pdf"),
+            _FakeEntry("report.docx"),
         ]
-        for f in mock_files:
-            f.name = f._mock_name
-            f.is_file.return_value = True
-        
-        mock_iterdir.return_value = mock_files
-        mock_is_file.return_value = True
         
         source_dir = Path("/fake/source")
         groups = scan_and_group(source_dir, "vacation")
         
         assert len(groups) == 0, "Should return empty list when no matches"
 
-    @patch('pathlib.Path.iterdir')
-    @patch('pathlib.Path.is_file')
-    def test_skips_directories(self, mock_is_file, mock_iterdir):
+    @patch('os.scandir')
+    def test_skips_directories(self, mock_scandir):
         """Directories should be skipped during scan."""
-        mock_file = Mock(spec=Path, name="vacation.jpg")
-        mock_file.name = "vacation.jpg"
-        mock_file.is_file.return_value = True
-        
-        mock_dir = Mock(spec=Path, name="subfolder")
-        mock_dir.name = "subfolder"
-        mock_dir.is_file.return_value = False
+        mock_file = _FakeEntry("vacation.jpg")
+        mock_dir = _mock_entry("vacation_subfolder", is_file=False)
         
-        mock_iterdir.return_value = [mock_file, mock_dir]
+        mock_scandir.return_value.__enter__.return_value = [mock_file, mock_dir]
         
         source_dir = Path("/fake/source")
         groups = scan_and_group(source_dir, "vacation")
@@ -181,21 +185,33 @@ class TestScanAndGroup:
         # Should only process the file, not the directory
         assert len(groups) == 1
         assert len(groups[0].files) == 1
+        mock_dir.is_file.assert_called_once_with()
+
+    def test_symlinked_files_included(self, tmp_path):
+        """Symlinks to files should be grouped like the files they point to."""
+        target = tmp_path / "elsewhere.jpg"
+        target.write_bytes(b"photo")
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        (source_dir / "vacation_beach.jpg").write_bytes(b"photo")
+        try:
+            os.symlink(target, source_dir / "vacation_linked.jpg")
+        except (OSError, NotImplementedError):
+            pytest.skip("symlinks not supported here")
+        
+        groups = scan_and_group(source_dir, "vacation")
+        
+        assert sorted(f.name for f in groups[0].files) == [
+            "vacation_beach.jpg", "vacation_linked.jpg"
+        ]
 
-    @patch('pathlib.Path.iterdir')
-    @patch('pathlib.Path.is_file')
-    def test_unicode_filenames_handled(self, mock_is_file, mock_iterdir):
+    @patch('os.scandir')
+    def test_unicode_filenames_handled(self, mock_scandir):
         """Unicode filenames should be processed correctly."""
-        mock_files = [
-            Mock(spec=Path, name="café_photo.jpg"),
-            Mock(spec=Path, name="日本語.jpg"),
+        mock_scandir.return_value.__enter__.return_value = [
+            _FakeEntry("café_photo.jpg"),
+            _FakeEntry("日本語.jpg"),
         ]
-        for f in mock_files:
-            f.name = f._mock_name
-            f.is_file.return_value = True
-        
-        mock_iterdir.return_value = mock_files
-        mock_is_file.return_value = True
         
         source_dir = Path("/fake/source")
         groups = scan_and_group(source_dir, "café|日本語")
@@ -203,14 +219,83 @@ class TestScanAndGroup:
         # Should handle Unicode filenames
         assert len(groups) >= 1, "Should detect groups with Unicode names"
 
+    @patch('photozipper.models._STAT_IS_FREE', True)
+    @patch('os.scandir')
+    def test_metadata_read_from_dir_entry(self, mock_scandir):
+        """Where stat data is free, size and mtime come from the DirEntry."""
+        entry = _mock_entry("vacation_beach.jpg")
+        mock_scandir.return_value.__enter__.return_value = [entry]
+        
+        groups = scan_and_group(Path("/fake/source"), "vacation")
+        
+        source_file = groups[0].files[0]
+        assert source_file.path == Path("/fake/source/vacation_beach.jpg")
+        assert source_file.size == 1024
+        assert source_file.modified_time == 1704110400.0
+        entry.stat.assert_called_once_with()
+
+    @patch('photozipper.models._STAT_IS_FREE', False)
+    @patch('os.scandir')
+    def test_scan_does_not_stat(self, mock_scandir):
+        """Where stat costs a syscall, the scan should leave metadata unset."""
+        entry = _mock_entry("vacation_beach.jpg")
+        mock_scandir.return_value.__enter__.return_value = [entry]
+        
+        groups = scan_and_group(Path("/fake/source"), "vacation")
+        
+        source_file = groups[0].files[0]
+        assert source_file.name == "vacation_beach.jpg"
+        assert source_file.size is None
+        assert source_file.modified_time is None
+        entry.stat.assert_not_called()
+
+    @patch('os.scandir')
+    def test_accepts_precompiled_pattern(self, mock_scandir):
+        """A precompiled pattern should group the same as its source string."""
+        mock_scandir.return_value.__enter__.return_value = [
+            _FakeEntry("trip2004_01.jpg"),
+            _FakeEntry("trip2005_01.jpg"),
+        ]
+        
+        groups = scan_and_group(Path("/fake/source"), re.compile(r"trip\d{4}"))
+        
+        assert {g.name for g in groups} == {"trip2004", "trip2005"}
+
+    @patch('os.scandir')
+    def test_exclude_extensions(self, mock_scandir):
+        """Files with excluded extensions should be skipped before matching."""
+        sidecar = _mock_entry("vacation_beach.XMP")
+        mock_scandir.return_value.__enter__.return_value = [
+            _FakeEntry("vacation_beach.jpg"),
+            sidecar,
+        ]
+        
+        groups = scan_and_group(
+            Path("/fake/source"), "vacation", exclude_exts=frozenset({"xmp"})
+        )
+        
+        assert [f.name for f in groups[0].files] == ["vacation_beach.jpg"]
+        sidecar.is_file.assert_not_called()
+
+    @patch('os.scandir')
+    def test_include_extensions(self, mock_scandir):
+        """Only files with included extensions should be grouped."""
+        mock_scandir.return_value.__enter__.return_value = [
+            _FakeEntry("vacation_beach.jpg"),
+            _FakeEntry("vacation_pool.HEIC"),
+            _FakeEntry("vacation_notes.txt"),
+            _FakeEntry("vacation_readme"),
+        ]
+        
+        groups = scan_and_group(
+            Path("/fake/source"), "vacation", include_exts=frozenset({"jpg", "heic"})
+        )
+        
+        assert sorted(f.name for f in groups[0].files) == [
+            "vacation_beach.jpg", "vacation_pool.HEIC"
+        ]
+
 
-# Test that module doesn't exist yet (TDD verification)
-def test_module_not_implemented_yet():
-    """Verify that pattern_matcher module doesn't exist yet (TDD check)."""
-    try:
-        from photozipper import pattern_matcher
-        # If we get here, module exists - tests should be updated
-        pytest.skip("Module already implemented - remove this test")
-    except (ImportError, AttributeError):
-        # Expected - module doesn't exist yet
-        pass
+def test_normalize_extensions():
+    """Extension lists should be lowercased with dots and blanks dropped."""
+    assert normalize_extensions(".JPG, heic,,.tmp") == frozenset({"jpg", "heic", "tmp"})
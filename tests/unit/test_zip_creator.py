@@ -3,25 +3,38 @@ Unit tests for zip creation logic.
 
 These tests verify the zip creator module functions using mocked zipfile operations.
 """
+import io
 import pytest
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock, mock_open
-import zipfile
+from unittest.mock import patch
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
 
+from photozipper.zip_creator import (
+    create_zip,
+    add_folder_to_zip,
+    create_zip_from_files
+)
 
-# These imports will fail until implementation exists - that's expected for TDD
-try:
-    from photozipper.zip_creator import (
-        create_zip,
-        add_folder_to_zip
-    )
-except ImportError:
-    # Expected during TDD - tests should fail
-    create_zip = None
-    add_folder_to_zip = None
+
+@pytest.fixture(scope="session")
+def sample_vacation_folder(tmp_path_factory):
+    """Read-only folder: photo1-3.jpg plus subfolder/nested.jpg, built once."""
+    folder = tmp_path_factory.mktemp("vacation_shared")
+    for i in (1, 2, 3):
+        (folder / f"photo{i}.jpg").touch()
+    (folder / "subfolder").mkdir()
+    (folder / "subfolder" / "nested.jpg").touch()
+    return folder
+
+
+def _zip_in_memory(folder: Path) -> ZipFile:
+    """Run add_folder_to_zip into an in-memory archive and reopen it for reading."""
+    buffer = io.BytesIO()
+    with ZipFile(buffer, 'w', compression=ZIP_DEFLATED) as zf:
+        add_folder_to_zip(zf, folder)
+    return ZipFile(buffer)
 
 
-@pytest.mark.skipif(create_zip is None, reason="Module not implemented yet")
 class TestZipCreation:
     """Test zip archive creation."""
 
@@ -30,8 +43,8 @@ class TestZipCreation:
         # Create a folder with test files
         folder = tmp_path / "vacation"
         folder.mkdir()
-        (folder / "photo1.jpg").write_text("photo1 content")
-        (folder / "photo2.jpg").write_text("photo2 content")
+        (folder / "photo1.jpg").touch()
+        (folder / "photo2.jpg").touch()
         
         zip_path = tmp_path / "vacation.zip"
         
@@ -42,7 +55,7 @@ class TestZipCreation:
         assert zip_path.exists()
         
         # Verify ZIP contents
-        with zipfile.ZipFile(zip_path, 'r') as zf:
+        with ZipFile(zip_path, 'r') as zf:
             names = zf.namelist()
             assert 'photo1.jpg' in names
             assert 'photo2.jpg' in names
@@ -60,7 +73,7 @@ class TestZipCreation:
         """Should propagate IO errors."""
         folder = tmp_path / "vacation"
         folder.mkdir()
-        (folder / "photo.jpg").write_text("photo")
+        (folder / "photo.jpg").touch()
         
         zip_path = tmp_path / "vacation.zip"
         
@@ -73,81 +86,77 @@ class TestZipCreation:
         """Should use ZIP_DEFLATED compression."""
         folder = tmp_path / "vacation"
         folder.mkdir()
+        # Tiny payload: only the header's compression type is checked here
+        (folder / "photo.txt").write_bytes(b"ab" * 8)
+        
+        zip_path = tmp_path / "vacation.zip"
+        
+        create_zip(folder, zip_path)
+        
+        with ZipFile(zip_path, 'r') as zf:
+            assert zf.getinfo('photo.txt').compress_type == ZIP_DEFLATED
+
+    def test_create_zip_compression_reduces_size(self, tmp_path):
+        """Deflated members should actually be smaller than the original."""
+        folder = tmp_path / "vacation"
+        folder.mkdir()
         # Create a file with repeating content that compresses well
-        (folder / "photo.txt").write_text("a" * 1000)
+        (folder / "photo.txt").write_bytes(b"a" * 1000)
         
         zip_path = tmp_path / "vacation.zip"
         
         create_zip(folder, zip_path)
         
-        # Verify ZIP uses compression (compressed size < original size)
-        with zipfile.ZipFile(zip_path, 'r') as zf:
+        with ZipFile(zip_path, 'r') as zf:
             info = zf.getinfo('photo.txt')
-            assert info.compress_type == zipfile.ZIP_DEFLATED
             assert info.compress_size < info.file_size
 
-
-@pytest.mark.skipif(add_folder_to_zip is None, reason="Module not implemented yet")
-class TestAddFolderToZip:
-    """Test adding folder contents to zip archive."""
-
-    def test_add_all_files_to_zip(self, tmp_path):
-        """Should add all files from folder to zip."""
+    def test_create_zip_stores_compressed_photos(self, tmp_path):
+        """Already-compressed photo formats should be stored, not deflated."""
         folder = tmp_path / "vacation"
         folder.mkdir()
-        (folder / "photo1.jpg").write_text("photo1")
-        (folder / "photo2.jpg").write_text("photo2")
-        (folder / "photo3.jpg").write_text("photo3")
+        (folder / "photo.jpg").write_text("a" * 1000)
+        (folder / "photo.HEIC").write_text("a" * 1000)
+        (folder / "notes.txt").write_text("a" * 1000)
         
-        zip_path = tmp_path / "test.zip"
+        zip_path = tmp_path / "vacation.zip"
         
-        with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
-            add_folder_to_zip(zf, folder)
+        create_zip(folder, zip_path)
         
+        with ZipFile(zip_path, 'r') as zf:
+            assert zf.getinfo('photo.jpg').compress_type == ZIP_STORED
+            assert zf.getinfo('photo.HEIC').compress_type == ZIP_STORED
+            assert zf.getinfo('notes.txt').compress_type == ZIP_DEFLATED
+
+
+class TestAddFolderToZip:
+    """Test adding folder contents to zip archive."""
+
+    def test_add_all_files_to_zip(self, sample_vacation_folder):
+        """Should add all files from folder to zip."""
         # Verify all files were added
-        with zipfile.ZipFile(zip_path, 'r') as zf:
+        with _zip_in_memory(sample_vacation_folder) as zf:
             names = zf.namelist()
             assert len(names) == 3
             assert 'photo1.jpg' in names
             assert 'photo2.jpg' in names
             assert 'photo3.jpg' in names
 
-    def test_skip_subdirectories(self, tmp_path):
+    def test_skip_subdirectories(self, sample_vacation_folder):
         """Should only add files, not directories."""
-        folder = tmp_path / "vacation"
-        folder.mkdir()
-        (folder / "photo.jpg").write_text("photo")
-        (folder / "subfolder").mkdir()  # Create subdirectory
-        (folder / "subfolder" / "nested.jpg").write_text("nested")
-        
-        zip_path = tmp_path / "test.zip"
-        
-        with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
-            add_folder_to_zip(zf, folder)
-        
-        # Should only have photo.jpg, not the subfolder or its contents
-        with zipfile.ZipFile(zip_path, 'r') as zf:
+        # Should only have the photos, not the subfolder or its contents
+        with _zip_in_memory(sample_vacation_folder) as zf:
             names = zf.namelist()
-            assert len(names) == 1
-            assert 'photo.jpg' in names
-            assert 'subfolder' not in names
+            assert sorted(names) == ['photo1.jpg', 'photo2.jpg', 'photo3.jpg']
+            assert not any(name.startswith('subfolder') for name in names)
             assert 'nested.jpg' not in names
 
-    def test_preserve_relative_paths(self, tmp_path):
+    def test_preserve_relative_paths(self, sample_vacation_folder):
         """Should use just filenames as archive names."""
-        folder = tmp_path / "vacation"
-        folder.mkdir()
-        (folder / "photo.jpg").write_text("photo")
-        
-        zip_path = tmp_path / "test.zip"
-        
-        with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
-            add_folder_to_zip(zf, folder)
-        
         # Should use just the filename, not full path
-        with zipfile.ZipFile(zip_path, 'r') as zf:
+        with _zip_in_memory(sample_vacation_folder) as zf:
             names = zf.namelist()
-            assert 'photo.jpg' in names
+            assert 'photo1.jpg' in names
             # Should not contain parent directories like "vacation/" prefix
             assert not any('/' in name for name in names)
 
@@ -155,16 +164,10 @@ class TestAddFolderToZip:
         """Should handle Unicode filenames in zip archives."""
         folder = tmp_path / "café"
         folder.mkdir()
-        (folder / "日本語.jpg").write_text("unicode content")
-        
-        zip_path = tmp_path / "test.zip"
+        (folder / "日本語.jpg").touch()
         
-        # Should not raise encoding errors
-        with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
-            add_folder_to_zip(zf, folder)
-        
-        # Verify file was added
-        with zipfile.ZipFile(zip_path, 'r') as zf:
+        # Should not raise encoding errors, and the file should be added
+        with _zip_in_memory(folder) as zf:
             names = zf.namelist()
             assert '日本語.jpg' in names
 
@@ -173,17 +176,11 @@ class TestAddFolderToZip:
         folder = tmp_path / "vacation"
         folder.mkdir()  # Empty folder
         
-        zip_path = tmp_path / "test.zip"
-        
-        with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
-            add_folder_to_zip(zf, folder)
-        
         # Should not crash, ZIP should exist but be empty
-        with zipfile.ZipFile(zip_path, 'r') as zf:
+        with _zip_in_memory(folder) as zf:
             assert len(zf.namelist()) == 0
 
 
-@pytest.mark.skipif(create_zip is None, reason="Module not implemented yet")
 class TestZipErrorHandling:
     """Test error handling in zip operations."""
 
@@ -192,7 +189,7 @@ class TestZipErrorHandling:
         """Should propagate write permission errors."""
         folder = tmp_path / "vacation"
         folder.mkdir()
-        (folder / "photo.jpg").write_text("photo")
+        (folder / "photo.jpg").touch()
         
         zip_path = tmp_path / "vacation.zip"
         
@@ -206,7 +203,7 @@ class TestZipErrorHandling:
         """Should propagate disk full errors."""
         folder = tmp_path / "vacation"
         folder.mkdir()
-        (folder / "photo.jpg").write_text("photo")
+        (folder / "photo.jpg").touch()
         
         zip_path = tmp_path / "vacation.zip"
         
@@ -216,12 +213,24 @@ class TestZipErrorHandling:
             create_zip(folder, zip_path)
 
 
-# Test that module doesn't exist yet (TDD verification)
-def test_module_not_implemented_yet():
-    """Verify that zip_creator module doesn't exist yet (TDD check)."""
-    try:
-        from photozipper import zip_creator
-        pytest.skip("Module already implemented - remove this test")
-    except (ImportError, AttributeError):
-        # Expected - module doesn't exist yet
-        pass
+class TestCreateZipFromFiles:
+    """Test building a zip archive straight from source files."""
+
+    def test_files_added_by_name(self, tmp_path):
+        """Should add each file under its bare filename."""
+        source = tmp_path / "source"
+        source.mkdir()
+        (source / "vacation_001.jpg").write_text("photo1")
+        (source / "vacation_notes.txt").write_text("a" * 1000)
+        
+        zip_path = tmp_path / "vacation.zip"
+        
+        create_zip_from_files(
+            [source / "vacation_001.jpg", source / "vacation_notes.txt"], zip_path
+        )
+        
+        with ZipFile(zip_path, 'r') as zf:
+            assert sorted(zf.namelist()) == ['vacation_001.jpg', 'vacation_notes.txt']
+            assert zf.read('vacation_001.jpg') == b"photo1"
+            assert zf.getinfo('vacation_001.jpg').compress_type == ZIP_STORED
+            assert zf.getinfo('vacation_notes.txt').compress_type == ZIP_DEFLATED